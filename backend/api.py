@@ -5,11 +5,11 @@ Handles audio upload, processing, and serves the React frontend.
 
 import os
 import sys
-import json
 import uuid
+import base64
 import asyncio
-import subprocess
-from typing import List, Dict, Any, Optional
+import functools
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
@@ -17,8 +17,11 @@ from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response
 from pydantic import BaseModel
+import orjson
+from cachetools import TTLCache
+import numpy as np
 import uvicorn
 
 # Add src directory to path
@@ -32,7 +35,8 @@ from database import CallAnalyzerDB
 app = FastAPI(
     title="Call Summary and Quality Analyzer API",
     description="API for analyzing customer care conversations",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for React frontend
@@ -44,40 +48,124 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize analyzers and database
-call_analyzer = CallAnalyzer()
-audio_transcriber = AudioTranscriber()
+# Initialize database; the analyzers are loaded after startup (see load_models)
+call_analyzer: Optional[CallAnalyzer] = None
+audio_transcriber: Optional[AudioTranscriber] = None
+models_loaded: Optional[asyncio.Task] = None
+# Set when load_models fails, so uploads can report it instead of a generic pipeline error
+models_load_error: Optional[Exception] = None
 db = CallAnalyzerDB("../call_analyzer.db")
 
-# In-memory storage for processing status (use Redis in production)
-processing_status = {}
-analysis_results = {}
+# Shared worker pool for the blocking pipeline stages (transcription, analysis)
+pipeline_executor = ThreadPoolExecutor(max_workers=max(2, os.cpu_count() or 1), thread_name_prefix="pipeline")
+
+async def load_models():
+    """Load the Whisper and NLP models off the event loop, then warm Whisper up and load BART."""
+    global call_analyzer, audio_transcriber, models_load_error
+    loop = asyncio.get_running_loop()
+    try:
+        audio_transcriber, call_analyzer = await asyncio.gather(
+            loop.run_in_executor(pipeline_executor, AudioTranscriber),
+            loop.run_in_executor(pipeline_executor, CallAnalyzer)
+        )
+    except Exception as e:
+        models_load_error = e
+        print(f"Model loading failed: {e}")
+        return
+    
+    # One second of silence so the first real upload does not pay for kernel setup;
+    # CallAnalyzer loads its summarizer lazily, so load it now alongside the warmup
+    warmup, summarizer = await asyncio.gather(
+        loop.run_in_executor(pipeline_executor, audio_transcriber.transcribe_with_whisper, np.zeros(16000, dtype=np.float32)),
+        loop.run_in_executor(pipeline_executor, call_analyzer.load_summarizer),
+        return_exceptions=True
+    )
+    if isinstance(warmup, Exception):
+        print(f"Whisper warmup failed: {warmup}")
+    if isinstance(summarizer, Exception):
+        print(f"Summarizer preload failed: {summarizer}")
+
+def models_unavailable_reason() -> Optional[str]:
+    """Why uploads cannot be processed, or None while the models are loaded or still loading."""
+    if models_loaded is None:
+        return "Models not loaded: model loading was never started"
+    if models_load_error is not None:
+        return f"Models not loaded: {models_load_error}"
+    return None
+
+@app.on_event("startup")
+async def start_model_loading():
+    """Start loading models in the background so uvicorn can serve requests right away."""
+    global models_loaded
+    models_loaded = asyncio.create_task(load_models())
+
+# Separate pool for SQLite calls so dashboard reads never queue behind transcription
+db_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="db")
+
+async def run_db(func, *args, **kwargs):
+    """Run a blocking CallAnalyzerDB method on the DB pool instead of the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, functools.partial(func, *args, **kwargs))
+
+# In-memory storage for processing status (use Redis in production); entries
+# expire so the process does not grow with every upload
+STATUS_TTL_SECONDS = 3600
+processing_status = TTLCache(maxsize=10_000, ttl=STATUS_TTL_SECONDS)
+analysis_results = TTLCache(maxsize=10_000, ttl=STATUS_TTL_SECONDS)
+
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 # Valid industries (restricted list)
 VALID_INDUSTRIES = ['eCommerce', 'Telecom', 'Healthcare', 'Travel', 'Real Estate', 'Customer Service', 'Insurance']
+VALID_INDUSTRIES_SET = frozenset(VALID_INDUSTRIES)
+INDUSTRIES_BODY = orjson.dumps({"industries": VALID_INDUSTRIES})
+
+# Accepted upload formats
+ALLOWED_AUDIO_EXTENSIONS = frozenset({'.mp3'})
+
+# Stage reported for a status read back from the database; only the terminal states
+# are persisted after upload, so anything else is still at the upload step
+SAVED_STATUS_STAGES = {'completed': 'completed', 'error': 'error'}
 
 # WebSocket connections for real-time updates
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
+        # Pending status updates per connection, drained by the connection's handler
+        self.queues: Dict[WebSocket, asyncio.Queue] = {}
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        self.queues[websocket] = asyncio.Queue()
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self.queues.pop(websocket, None)
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
+    async def broadcast(self, message: Dict[str, Any]):
+        # Iterate a snapshot so connections closing meanwhile cannot break the loop
+        for connection in list(self.active_connections):
+            queue = self.queues.get(connection)
+            if queue is not None:
+                queue.put_nowait(message)
+
+    async def next_batch(self, websocket: WebSocket) -> List[Dict[str, Any]]:
+        """Wait for pending updates and drain them, keeping the latest status per analysis."""
+        queue = self.queues[websocket]
+        latest = {}
+        message = await queue.get()
+        while True:
+            latest[message["analysis_id"]] = message
             try:
-                await connection.send_text(message)
-            except:
-                # Remove disconnected connections
-                self.active_connections.remove(connection)
+                message = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        return list(latest.values())
 
 manager = ConnectionManager()
 
@@ -115,33 +203,63 @@ class UserUpdateRequest(BaseModel):
     role: Optional[str] = "user"
     is_active: Optional[bool] = True
 
+# Directories already created by this process, so uploads skip the mkdir syscalls
+known_dirs: Set[str] = set()
+
+def ensure_dir(path: str):
+    """Create ``path`` (and parents) once per process."""
+    if path not in known_dirs:
+        os.makedirs(path, exist_ok=True)
+        known_dirs.add(path)
+
 # Create necessary directories
-os.makedirs("uploads", exist_ok=True)
+ensure_dir("uploads")
 
 @app.websocket("/ws/{analysis_id}")
 async def websocket_endpoint(websocket: WebSocket, analysis_id: str):
     """WebSocket endpoint for real-time progress updates."""
     await manager.connect(websocket)
+    # Also listen on the socket so a client that goes away is noticed right away,
+    # not only when the next update fails to send
+    receive_task = asyncio.ensure_future(websocket.receive())
+    batch_task = None
     try:
-        while True:
-            # Send current status if available
-            if analysis_id in processing_status:
-                status = processing_status[analysis_id]
-                await websocket.send_json(status)
-                if status.get("status") in {"completed", "error"}:
-                    await websocket.send_json(status) 
+        status = processing_status.get(analysis_id)
+        if status is not None:
+            await websocket.send_text(orjson.dumps([status]).decode())
+
+        # Messages are JSON arrays; each frame carries every update queued since the last one
+        while status is not None and status.get("status") not in {"completed", "error"}:
+            if batch_task is None:
+                batch_task = asyncio.ensure_future(manager.next_batch(websocket))
+            done, _ = await asyncio.wait({batch_task, receive_task}, return_when=asyncio.FIRST_COMPLETED)
+
+            if receive_task in done:
+                if receive_task.result()["type"] == "websocket.disconnect":
                     break
-            else:
-                break
-            
-            await asyncio.sleep(1)  # Send updates every second
+                # Clients have nothing to say on this socket; ignore the message and keep listening
+                receive_task = asyncio.ensure_future(websocket.receive())
+
+            if batch_task in done:
+                batch = batch_task.result()
+                batch_task = None
+                await websocket.send_text(orjson.dumps(batch).decode())
+                status = next((update for update in batch if update["analysis_id"] == analysis_id), status)
     except WebSocketDisconnect:
         pass
     finally:
+        for task in (receive_task, batch_task):
+            if task is not None:
+                task.cancel()
         manager.disconnect(websocket)
 
 async def update_progress(analysis_id: str, status: str, progress: int, stage: str, message: str):
     """Update processing progress and notify WebSocket clients."""
+    # Nothing new to tell clients if only the timestamp would change
+    previous = processing_status.get(analysis_id)
+    if previous and (previous["status"], previous["progress"], previous["stage"]) == (status, progress, stage):
+        return
+    
     status_update = {
         "analysis_id": analysis_id,
         "status": status,
@@ -154,44 +272,55 @@ async def update_progress(analysis_id: str, status: str, progress: int, stage: s
     processing_status[analysis_id] = status_update
     
     # Broadcast to WebSocket clients
-    await manager.broadcast(json.dumps(status_update))
+    await manager.broadcast(status_update)
 
 async def process_audio_file(file_path: str, analysis_id: str, industry: str = "general", user_id: str = "default_user"):
-    """Background task to process audio file with complete data capture."""
+    """Background task to process audio file with complete data capture.
+
+    The audio is decoded inside the transcription stage, so queued uploads hold
+    only their file on disk, not the decoded signal in memory.
+    """
     try:
-        await update_progress(analysis_id, "processing", 10, "transcription", "Starting audio transcription...")
+        # Uploads accepted while the models are still loading wait for them here
+        reason = models_unavailable_reason()
+        if reason is None:
+            await models_loaded
+            reason = models_unavailable_reason()
+        if reason is not None:
+            await run_db(db.save_processing_status, analysis_id, "error", 0, reason)
+            await update_progress(analysis_id, "error", 0, "upload", reason)
+            return
         
-        # Run CPU-intensive transcription in thread pool to avoid blocking
+        # Run CPU-intensive transcription in thread pool to avoid blocking;
+        # the progress broadcast goes out while the worker is already busy
         loop = asyncio.get_running_loop()
-        with ThreadPoolExecutor() as pool:
-            transcription = await loop.run_in_executor(pool, audio_transcriber.transcribe_with_whisper, file_path)
+        transcription, _ = await asyncio.gather(
+            loop.run_in_executor(pipeline_executor, audio_transcriber.transcribe_with_whisper, file_path),
+            update_progress(analysis_id, "processing", 10, "transcription", "Starting audio transcription...")
+        )
         
         if not transcription:
             await update_progress(analysis_id, "error", 0, "transcription", "Failed to transcribe audio")
             return
 
 
-        await update_progress(analysis_id, "processing", 30, "transcription", "Starting Speaker Identification...")
-        
-        # Run CPU-intensive transcription in thread pool to avoid blocking
-        loop = asyncio.get_running_loop()
-        with ThreadPoolExecutor() as pool:
-            transcription_result = await loop.run_in_executor(pool, audio_transcriber.speaker_with_diarization, file_path, transcription)
+        # Diarization needs the transcribed segments, so it follows transcription
+        transcription_result, _ = await asyncio.gather(
+            loop.run_in_executor(pipeline_executor, audio_transcriber.speaker_with_diarization, file_path, transcription),
+            update_progress(analysis_id, "processing", 30, "transcription", "Starting Speaker Identification...")
+        )
         
         if not transcription_result:
             await update_progress(analysis_id, "error", 0, "transcription", "Failed to diarization")
             return
 
-        await update_progress(analysis_id, "processing", 60, "analysis", "Performing NLP analysis...") 
-
         transcription_result['industry'] = industry
 
-        
-        
         # Run CPU-intensive analysis in thread pool to avoid blocking
-        loop = asyncio.get_running_loop()
-        with ThreadPoolExecutor() as pool:
-            analysis_result = await loop.run_in_executor(pool, call_analyzer.analyze_conversation, transcription_result)
+        analysis_result, _ = await asyncio.gather(
+            loop.run_in_executor(pipeline_executor, call_analyzer.analyze_conversation, transcription_result),
+            update_progress(analysis_id, "processing", 60, "analysis", "Performing NLP analysis...")
+        )
         
         await update_progress(analysis_id, "processing", 80, "saving", "Saving analysis results...")
          
@@ -213,20 +342,19 @@ async def process_audio_file(file_path: str, analysis_id: str, industry: str = "
             'quality_score': analysis_result.get('quality_score', 0.0)
         }
 
-        await update_progress(analysis_id, "processing", 90, "Saving", "Generating visualizations...")
-        
-        # Save to database (run in thread pool to avoid blocking)
-        loop = asyncio.get_running_loop()
-        with ThreadPoolExecutor() as pool:
-            success = await loop.run_in_executor(pool, db.save_analysis_result, complete_analysis_data)
+        # Save to database (run on the DB pool to avoid blocking)
+        # The DB writer thread serializes and inserts; wait on its Future without tying up a DB worker
+        success = await asyncio.wrap_future(db.submit_analysis_result(complete_analysis_data))
         if not success:
             await update_progress(analysis_id, "error", 0, "saving", "Failed to save analysis results")
             return
              
         
-        # Update final status
-        db.save_processing_status(analysis_id, "completed", 100, "Analysis completed successfully")
-        await update_progress(analysis_id, "completed", 100, "completed", "Analysis completed successfully!")
+        # Update final status (DB write and client notification are independent)
+        await asyncio.gather(
+            run_db(db.save_processing_status, analysis_id, "completed", 100, "Analysis completed successfully"),
+            update_progress(analysis_id, "completed", 100, "completed", "Analysis completed successfully!")
+        )
         
         # Keep audio file for user access (don't delete)
         # if os.path.exists(file_path):
@@ -234,7 +362,7 @@ async def process_audio_file(file_path: str, analysis_id: str, industry: str = "
             
     except Exception as e:
         error_msg = f"Processing failed: {str(e)}"
-        db.save_processing_status(analysis_id, "error", 0, error_msg)
+        await run_db(db.save_processing_status, analysis_id, "error", 0, error_msg)
         await update_progress(analysis_id, "error", 0, "error", error_msg)
 
 
@@ -248,44 +376,41 @@ async def upload_audio(
     """Upload and process audio file with user-based storage."""
     
     # Validate industry
-    if industry not in VALID_INDUSTRIES:
+    if industry not in VALID_INDUSTRIES_SET:
         raise HTTPException(
             status_code=400, 
             detail=f"Invalid industry. Must be one of: {', '.join(VALID_INDUSTRIES)}"
         )
 
+    # Refuse uploads up front when the models failed to load (or were never started)
+    reason = models_unavailable_reason()
+    if reason is not None:
+        raise HTTPException(status_code=503, detail=reason)
+
     try:    
         # Generate unique analysis ID
         analysis_id = str(uuid.uuid4())
         
         # Validate file type
-        if not file.filename.lower().endswith(('.mp3')):
+        if os.path.splitext(file.filename)[1].lower() not in ALLOWED_AUDIO_EXTENSIONS:
             raise HTTPException(status_code=400, detail="Unsupported file format")
     
     
         # Create user-specific upload directory
         user_upload_dir = f"uploads/{user_id}"
-        os.makedirs(user_upload_dir, exist_ok=True)
+        ensure_dir(user_upload_dir)
 
         # 2. Save uploaded file
         input_file_path = f"{user_upload_dir}/{analysis_id}_{file.filename}"
         with open(input_file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-
-        # 3. Prepare output path (change to .wav)
-        file_path = input_file_path.rsplit(".", 1)[0] + ".wav"
-
-        # 4. Convert using ffmpeg     
-        subprocess.run(
-            ["ffmpeg", "-y", "-i", input_file_path, "-ac", "1", "-ar", "16000", file_path],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )     
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+
+        file_path = input_file_path
         
         # Initialize processing status
         processing_status[analysis_id] = {
+            "analysis_id": analysis_id,
             "status": "processing",
             "progress": 0,
             "stage": "upload",
@@ -297,7 +422,7 @@ async def upload_audio(
         }
         
         # Save initial processing status to database
-        db.save_processing_status(analysis_id, "processing", 0, "File uploaded successfully")
+        await run_db(db.save_processing_status, analysis_id, "processing", 0, "File uploaded successfully")
         
         # Start background processing
         background_tasks.add_task(process_audio_file, file_path, analysis_id, industry, user_id)
@@ -316,11 +441,21 @@ async def upload_audio(
 @app.get("/api/status/{analysis_id}", response_model=ProcessingStatus)
 async def get_analysis_status(analysis_id: str):
     #print(f"Status requested for analysis_id={analysis_id}")
-    if analysis_id not in processing_status:
-        print(f"Analysis {analysis_id} not found")
-        raise HTTPException(status_code=404, detail="Analysis not found")
+    status = processing_status.get(analysis_id)
+    if status is None:
+        # Expired from memory: fall back to the status persisted in the database
+        saved = await run_db(db.get_processing_status, analysis_id)
+        if not saved:
+            print(f"Analysis {analysis_id} not found")
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        status = {
+            "analysis_id": analysis_id,
+            "status": saved["status"],
+            "progress": saved["progress"],
+            "stage": SAVED_STATUS_STAGES.get(saved["status"], "upload"),
+            "message": saved["message"] or ""
+        }
     
-    status = processing_status[analysis_id]
     #print(f"Returning status for {analysis_id}: {status}")
     return ProcessingStatus(**status)
 
@@ -332,14 +467,20 @@ async def get_database_stats(
 ):
     """Get comprehensive database statistics for homepage with optional filters"""
     try:
-        stats = db.get_database_stats(date_from=date_from, date_to=date_to, industry=industry)
-        
-        # Add top user performance data to stats
-        top_user_performance = db.get_top_user_performance_by_sentiment(
-            date_from=date_from, 
-            date_to=date_to, 
-            industry=industry
+        # Both aggregates are independent reads, so run them concurrently
+        stats, top_user_performance = await asyncio.gather(
+            # CallAnalyzerDB memoizes both aggregates itself
+            run_db(db.get_database_stats, date_from=date_from, date_to=date_to, industry=industry),
+            run_db(
+                db.get_top_user_performance_by_sentiment,
+                date_from=date_from, 
+                date_to=date_to, 
+                industry=industry
+            )
         )
+        
+        # Add top user performance data to stats (copy so the cached dict is not modified)
+        stats = dict(stats)
         stats['top_user_performance'] = top_user_performance
         
         return stats
@@ -352,17 +493,17 @@ async def get_database_stats(
 def format_time(seconds):
     seconds = int(seconds)  # ensure integer
     if seconds > 60:
-        minutes = seconds // 60
-        remaining_seconds = seconds % 60
+        minutes, remaining_seconds = divmod(seconds, 60)
         return f"{minutes}:{remaining_seconds:02d}"
     return str(seconds)
 
 @app.get("/api/results/{analysis_id}")
-async def get_results(analysis_id: str):
-    """Get analysis results"""
+async def get_results(analysis_id: str, fields: Optional[str] = None):
+    """Get analysis results; `fields` (comma-separated columns) returns just those columns"""
     try:
         
-        results = db.get_analysis_result(analysis_id)
+        field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+        results = await run_db(db.get_analysis_result, analysis_id, fields=field_list)
         if results:           
             
             return results
@@ -371,6 +512,11 @@ async def get_results(analysis_id: str):
                 status_code=404,
                 content={"error": "Analysis results not found"}
             )
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": str(e)}
+        )
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -385,12 +531,14 @@ async def get_topic_sentiments(
 ):
     """Get topic-sentiment analysis data for dashboard with optional filters."""
     try: 
-        data = db.get_topic_sentiment_analysis(
+        # CallAnalyzerDB memoizes this aggregate itself
+        data = await run_db(
+            db.get_topic_sentiment_analysis,
             date_from=date_from,
             date_to=date_to,
             industry=industry
         )
-        return JSONResponse(content=data)
+        return ORJSONResponse(content=data)
     except Exception as e:
         print(f"Error getting topic sentiments: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get topic sentiments: {str(e)}")
@@ -399,71 +547,77 @@ async def get_topic_sentiments(
 async def list_analyses(user_id: str = None):
     """List all completed analyses, optionally filtered by user."""
     try:
+        # Rows come back already shaped for the listing
         if user_id:
-            # Get analyses for specific user from database
-            db_results = db.get_analysis_results_by_user(user_id)
-            analyses = []
-            for result in db_results:
-                analyses.append({
-                    "analysis_id": result["analysis_id"],
-                    "processed_at": result["processed_at"],
-                    "source_file": result["source_file"],
-                    "industry": result["industry"],
-                    "duration": result["duration"],
-                    "participants": result["participants"],
-                    "sentiment": result["sentiment"],
-                    "quality_score": result.get("analysis", {}).get("quality_score", 0.0),
-                    "file_path": result.get("file_path", "")
-                })
+            analyses = await run_db(db.get_analysis_summaries, user_id=user_id, limit=50)
         else:
-            # Get all analyses from database
-            db_results = db.get_all_analysis_results()
-            analyses = []
-            for result in db_results:
-                analyses.append({
-                    "analysis_id": result["analysis_id"],
-                    "processed_at": result["processed_at"],
-                    "source_file": result["source_file"],
-                    "industry": result["industry"],
-                    "duration": result["duration"],
-                    "participants": result["participants"],
-                    "sentiment": result["sentiment"],
-                    "quality_score": result.get("analysis", {}).get("quality_score", 0.0),
-                    "file_path": result.get("file_path", "")
-                })
+            analyses = await run_db(db.get_analysis_summaries)
         
         return {"analyses": analyses}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve analyses: {str(e)}")
 
 
-@app.get("/api/user/{user_id}/status")
-async def get_user_status(user_id: str):
-    """Get user status with saved audio files and analysis count."""
+# Keyset pagination: a cursor is the (processed_at, analysis_id) of a page's last row,
+# opaque to clients
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Cursor pointing just past ``row`` in newest-first order."""
+    return base64.urlsafe_b64encode(orjson.dumps([row["processed_at"], row["analysis_id"]])).decode()
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of encode_cursor; raises on anything it did not produce."""
+    processed_at, analysis_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+    return str(processed_at), str(analysis_id)
+
+def list_user_audio_files(user_upload_dir: str) -> List[Dict[str, Any]]:
+    """List the uploaded audio files in a user's upload directory."""
+    audio_files = []
     try:
-        # Get user's analyses from database
-        user_analyses = db.get_analysis_results_by_user(user_id)
-        
-        # Get user's audio files
-        user_upload_dir = f"uploads/{user_id}"
-        audio_files = []
-        if os.path.exists(user_upload_dir):
-            for file in os.listdir(user_upload_dir):
-                if file.lower().endswith(('.mp3')):
-                    file_path = os.path.join(user_upload_dir, file)
-                    file_stats = os.stat(file_path)
+        with os.scandir(user_upload_dir) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1].lower() in ALLOWED_AUDIO_EXTENSIONS:
+                    file_stats = entry.stat()
                     audio_files.append({
-                        "filename": file,
+                        "filename": entry.name,
                         "size": file_stats.st_size,
                         "created_at": datetime.fromtimestamp(file_stats.st_ctime).isoformat(),
-                        "path": file_path
+                        "path": entry.path
                     })
+    except FileNotFoundError:
+        # User has not uploaded anything yet
+        pass
+    return audio_files
+
+@app.get("/api/user/{user_id}/status")
+async def get_user_status(user_id: str, limit: int = 50, cursor: Optional[str] = None):
+    """Get user status with saved audio files and analysis count.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next page of analyses.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        # Get user's analyses from database and audio files from disk concurrently
+        user_analyses, audio_files = await asyncio.gather(
+            run_db(db.get_analysis_results_by_user, user_id, limit=limit, after=after),
+            asyncio.to_thread(list_user_audio_files, f"uploads/{user_id}")
+        )
         
+        # A full page may have more behind it; the cursor seeks past its last row
+        last = user_analyses[-1] if len(user_analyses) == limit else None
         return {
             "user_id": user_id,
             "total_analyses": len(user_analyses),
             "audio_files": audio_files,
             "recent_analyses": user_analyses[:5],  # Last 5 analyses
+            "analyses": user_analyses,
+            "next_cursor": encode_cursor(last) if last else None,
             "status": "active" if user_analyses else "new"
         }
     except Exception as e:
@@ -472,13 +626,13 @@ async def get_user_status(user_id: str):
 @app.get("/api/industries")
 async def get_available_industries():
     """Get list of available industries."""
-    return {"industries": VALID_INDUSTRIES}
+    return Response(content=INDUSTRIES_BODY, media_type="application/json")
 
 @app.get("/api/users")
 async def get_all_users():
     """Get all users."""
     try:
-        users = db.get_all_users()
+        users = await run_db(db.get_all_users)
         return {"users": users}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get users: {str(e)}")
@@ -488,13 +642,14 @@ async def get_user_performance(user_id: str, date_from: str = None, date_to: str
     """Get comprehensive performance metrics for a specific user/agent."""
     try:
         # Check if user exists
-        user = db.get_user_by_id(user_id)
+        user = await run_db(db.get_user_by_id, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        performance_data = db.get_user_performance_metrics(user_id, date_from, date_to)
+        performance_data = await run_db(db.get_user_performance_metrics, user_id, date_from, date_to)
         
-        # Add user info to the response
+        # Add user info to the response (copy so the cached dict is not modified)
+        performance_data = dict(performance_data)
         performance_data['user_info'] = user
         
         return {"performance": performance_data}
@@ -507,7 +662,8 @@ async def get_user_performance(user_id: str, date_from: str = None, date_to: str
 async def get_topic_statistics(date_from: str = None, date_to: str = None, industry: str = None):
     """Get topic distribution statistics with optional filtering."""
     try:
-        topic_stats = db.get_topic_statistics(date_from=date_from, date_to=date_to, industry=industry)
+        # CallAnalyzerDB memoizes this aggregate itself
+        topic_stats = await run_db(db.get_topic_statistics, date_from=date_from, date_to=date_to, industry=industry)
         return {"topic_statistics": topic_stats}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get topic statistics: {str(e)}")
@@ -516,7 +672,7 @@ async def get_topic_statistics(date_from: str = None, date_to: str = None, indus
 async def get_history(date_from: str = None, date_to: str = None):
     """Get analysis history with optional date filtering"""
     try:
-        history = db.get_analysis_history(date_from=date_from, date_to=date_to)
+        history = await run_db(db.get_analysis_history, date_from=date_from, date_to=date_to)
         return {"history": history}
     except Exception as e:
         return JSONResponse(
@@ -529,7 +685,7 @@ async def get_history(date_from: str = None, date_to: str = None):
 async def clear_all_data():
     """Clear all data from tables without dropping table structure."""
     try:
-        success = db.clear_all_data()
+        success = await run_db(db.clear_all_data)
         if success:
             # Also clear in-memory storage
             global processing_status, analysis_results
@@ -4,225 +4,903 @@ Handles all database operations for audio analysis data storage and retrieval.
 """
 
 import sqlite3
-import json
+import logging
+import orjson
 import os
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import threading
+import queue
+import zlib
+import functools
+import inspect
+from pathlib import Path
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Optional, Any, Tuple
 from contextlib import contextmanager
+from concurrent.futures import Future
+from cachetools import TTLCache
+
+# Save-path tracing goes through logging so it costs nothing unless DEBUG is enabled
+log = logging.getLogger(__name__)
+
+# Column order for the listing queries, zipped straight onto plain row tuples
+_SUMMARY_COLUMNS = ('analysis_id', 'processed_at', 'source_file', 'industry', 'duration',
+                    'participants', 'sentiment', 'quality_score', 'file_path')
+_HISTORY_COLUMNS = ('analysis_id', 'processed_at', 'source_file', 'industry', 'duration',
+                    'participants', 'sentiment', 'summary', 'quality_score')
+# Per-user listings leave out the transcript, conversation and other bulky JSON columns
+_LISTING_COLUMNS = ('analysis_id', 'processed_at', 'source_file', 'industry', 'duration',
+                    'participants', 'sentiment', 'overall_sentiment_label', 'overall_sentiment_score',
+                    'intents_data', 'summary', 'quality_score', 'file_path')
+
+# orjson handles the numpy values coming out of the ML pipeline natively
+_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _dumps(obj: Any) -> str:
+    """Serialize a JSON column value to text."""
+    return orjson.dumps(obj, option=_JSON_OPTIONS).decode()
+
+# Bulky columns are stored as zlib BLOBs once they pass this size; older TEXT rows still read fine
+_COMPRESS_MIN_BYTES = 1024
+
+def _compress(text: str):
+    """Compress a large text value for storage, leaving short values as TEXT."""
+    data = text.encode()
+    if len(data) < _COMPRESS_MIN_BYTES:
+        return text
+    return zlib.compress(data, 3)
+
+def _decompress(value) -> str:
+    """Inverse of _compress; accepts both BLOB and legacy TEXT values."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode()
+    return value
+
+# Hot-path statements live at module level so every call reuses the connection's prepared statement.
+# Re-saves upsert in place (keeping the row, its created_at and rows that reference it)
+# rather than INSERT OR REPLACE's delete + insert
+_ANALYSIS_UPSERT = '''
+    ON CONFLICT(analysis_id) DO UPDATE SET
+        user_id = excluded.user_id,
+        processed_at = excluded.processed_at,
+        source_file = excluded.source_file,
+        industry = excluded.industry,
+        duration = excluded.duration,
+        participants = excluded.participants,
+        sentiment = excluded.sentiment,
+        transcription_confidence = excluded.transcription_confidence,
+        transcription_language = excluded.transcription_language,
+        intents_data = excluded.intents_data,
+        overall_sentiment_label = excluded.overall_sentiment_label,
+        overall_sentiment_score = excluded.overall_sentiment_score,
+        participant_sentiments = excluded.participant_sentiments,
+        topics_data = excluded.topics_data,
+        summary = excluded.summary,
+        quality_score = excluded.quality_score,
+        file_path = excluded.file_path,
+        updated_at = CURRENT_TIMESTAMP
+'''
+_INSERT_ANALYSIS_SQL = '''
+    INSERT INTO analysis_results (
+        analysis_id, user_id, processed_at, source_file, industry, duration, participants,
+        sentiment, transcription_confidence, transcription_language,
+        intents_data, overall_sentiment_label, overall_sentiment_score,
+        participant_sentiments, topics_data, summary, quality_score, file_path
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+    )
+''' + _ANALYSIS_UPSERT
+# Same insert fed from one JSON array of row arrays, so a large batch binds a single parameter
+# (WHERE true keeps SQLite from parsing ON CONFLICT as part of the SELECT)
+_INSERT_ANALYSIS_JSON_SQL = '''
+    INSERT INTO analysis_results (
+        analysis_id, user_id, processed_at, source_file, industry, duration, participants,
+        sentiment, transcription_confidence, transcription_language,
+        intents_data, overall_sentiment_label, overall_sentiment_score,
+        participant_sentiments, topics_data, summary, quality_score, file_path
+    )
+    SELECT value ->> 0, value ->> 1, value ->> 2, value ->> 3, value ->> 4, value ->> 5,
+           value ->> 6, value ->> 7, value ->> 8, value ->> 9, value ->> 10, value ->> 11,
+           value ->> 12, value ->> 13, value ->> 14, value ->> 15, value ->> 16, value ->> 17
+    FROM json_each(?) WHERE true
+''' + _ANALYSIS_UPSERT
+# Batches at least this large take the json_each path (None disables it). Measured against
+# executemany on CPython 3.11 / SQLite 3.40 it was ~20-35% slower at 100-20000 rows, so it is
+# off by default; set a threshold where the bind overhead of the driver in use dominates
+_JSON_INSERT_MIN_ROWS: Optional[int] = None
+_INSERT_BLOBS_SQL = '''
+    INSERT INTO analysis_results_blobs (
+        analysis_id, transcription_text, conversation_data, insights
+    ) VALUES (?, ?, ?, ?)
+    ON CONFLICT(analysis_id) DO UPDATE SET
+        transcription_text = excluded.transcription_text,
+        conversation_data = excluded.conversation_data,
+        insights = excluded.insights
+'''
+# Full analyses are the scalar row joined with its blobs
+_ANALYSIS_FROM = 'analysis_results LEFT JOIN analysis_results_blobs USING (analysis_id)'
+_GET_ANALYSIS_SQL = f'SELECT * FROM {_ANALYSIS_FROM} WHERE analysis_id = ?'
+_SAVE_STATUS_SQL = '''
+    INSERT OR REPLACE INTO processing_status (
+        analysis_id, status, progress, message
+    ) VALUES (?, ?, ?, ?)
+'''
+_GET_STATUS_SQL = 'SELECT * FROM processing_status WHERE analysis_id = ?'
+
+# Adds (:sign = 1) or removes (:sign = -1) the topics of the analyses matched by {where}
+# to topic_stats_daily. Each (date, industry, topic) row counts the conversations mentioning
+# the topic, its mentions (dominant topics plus topic_scores entries above 0.1, so one
+# conversation can mention a topic twice), their score total and the dominant mentions
+# alone; topic '' rows count the conversations that carried topics data.
+_TOPIC_ROLLUP_SQL = '''
+    INSERT INTO topic_stats_daily (date, industry, topic, conversations, mentions, sum_score, dominant_mentions)
+    WITH source AS MATERIALIZED (
+        SELECT analysis_id, DATE(processed_at) as date, industry,
+               CASE WHEN json_valid(topics_data) THEN topics_data END as topics
+        FROM analysis_results
+        WHERE topics_data IS NOT NULL AND topics_data != '' AND {where}
+    ),
+    dominant AS (
+        SELECT s.analysis_id, s.date, s.industry,
+               CASE d.type WHEN 'array' THEN d.value ->> 0 ELSE d.value ->> '$.topic' END as topic,
+               CASE d.type WHEN 'array' THEN d.value ->> 1 ELSE COALESCE(d.value ->> '$.score', 0) END as score
+        FROM source s, json_each(s.topics, '$.dominant_topics') d
+        WHERE json_type(s.topics, '$.dominant_topics') = 'array'
+        AND ((d.type = 'array' AND json_array_length(d.value) >= 2) OR d.type = 'object')
+    ),
+    mentions AS (
+        SELECT analysis_id, date, industry, topic, score, 1 as is_dominant FROM dominant WHERE topic != ''
+        UNION ALL
+        SELECT s.analysis_id, s.date, s.industry, ts.key, ts.value, 0
+        FROM source s, json_each(s.topics, '$.topic_scores') ts
+        WHERE json_type(s.topics, '$.topic_scores') = 'object'
+        AND ts.type IN ('integer', 'real') AND ts.value > 0.1
+        UNION ALL
+        SELECT analysis_id, date, industry, '', 0, 0 FROM source
+    )
+    SELECT date, industry, topic, :sign * COUNT(DISTINCT analysis_id), :sign * COUNT(*),
+           :sign * TOTAL(score), :sign * SUM(is_dominant)
+    FROM mentions WHERE true
+    GROUP BY date, industry, topic
+    ON CONFLICT(date, industry, topic) DO UPDATE SET
+        conversations = conversations + excluded.conversations,
+        mentions = mentions + excluded.mentions,
+        sum_score = sum_score + excluded.sum_score,
+        dominant_mentions = dominant_mentions + excluded.dominant_mentions
+'''
+
+# Fixed SQL for the filtered listings: missing date filters bind as _MIN_DAY/_MAX_DAY
+# (defined below), so each statement is prepared once per connection and stays sargable
+_HISTORY_SQL = f'''
+    SELECT {', '.join(_HISTORY_COLUMNS)}
+    FROM analysis_results
+    WHERE processed_at >= :date_from AND processed_at < :date_end
+    ORDER BY processed_at DESC LIMIT :limit
+'''
+# The per-user analyses that get_user_performance_metrics aggregates in one pass
+_USER_METRICS_SQL = '''
+    SELECT
+        overall_sentiment_label,
+        overall_sentiment_score,
+        quality_score,
+        duration,
+        processed_at,
+        industry,
+        DATE(processed_at) as call_date,
+        processed_at >= DATE('now', '-30 days') as is_recent,
+        CASE WHEN intents_data IS NOT NULL
+            THEN json_extract(intents_data, '$[0].intent')
+        END as top_intent
+    FROM analysis_results
+    WHERE user_id = :user_id
+    AND processed_at >= :date_from AND processed_at < :date_end
+'''
+
+# Tallies conversation sentiment for the first five topics of each analysis. Topics are
+# the 'topics' list, else the topic_scores keys, else the top-level keys (or list items) of
+# topics_data. Kind 0 rows hold one raw topic each; the kind 1 row holds the analysis
+# count and the positive sentiment scores behind the average.
+_TOPIC_SENTIMENT_SQL = '''
+    WITH filtered AS MATERIALIZED (
+        SELECT
+            analysis_id,
+            LOWER(overall_sentiment_label) as label,
+            overall_sentiment_score as score,
+            CASE WHEN topics_data != '' AND json_valid(topics_data)
+                  AND participant_sentiments != '' AND json_valid(participant_sentiments)
+                THEN topics_data END as topics,
+            topics_data = '' OR (json_valid(topics_data)
+                AND (participant_sentiments = '' OR json_valid(participant_sentiments))) as parsed
+        FROM analysis_results
+        WHERE topics_data IS NOT NULL AND participant_sentiments IS NOT NULL
+        AND processed_at >= :date_from AND processed_at < :date_end
+        AND (:industry IS NULL OR industry = :industry)
+    ),
+    listed AS (
+        SELECT
+            f.label,
+            CASE
+                WHEN typeof(t.key) = 'text' THEN t.key
+                WHEN t.type = 'object' THEN t.value ->> '$.topic'
+                WHEN t.type = 'text' THEN t.value
+            END as topic,
+            ROW_NUMBER() OVER (PARTITION BY f.analysis_id ORDER BY t.id) as position
+        FROM filtered f, json_each(f.topics, CASE
+            WHEN json_type(f.topics, '$.topics') IS NOT NULL THEN '$.topics'
+            WHEN json_type(f.topics, '$.topic_scores') IS NOT NULL THEN '$.topic_scores'
+            ELSE '$'
+        END) t
+    )
+    SELECT 0 as kind, topic,
+           COUNT(*) FILTER (WHERE label IN ('positive', 'satisfied', 'happy')),
+           COUNT(*) FILTER (WHERE label IN ('negative', 'frustrated', 'angry', 'concerned')),
+           COUNT(*)
+    FROM listed
+    WHERE position <= 5 AND topic IS NOT NULL
+    GROUP BY topic
+    UNION ALL
+    SELECT 1, NULL, COUNT(*),
+           TOTAL(score) FILTER (WHERE parsed AND score > 0),
+           COUNT(*) FILTER (WHERE parsed AND score > 0)
+    FROM filtered
+    ORDER BY kind, topic
+'''
+
+# Statements that must stay index searches on analysis_results, with representative parameters;
+# init_database warns if a schema or query change turns one into a full table scan
+_PLAN_CHECKS = {
+    'user metrics': (_USER_METRICS_SQL, {'user_id': '', 'date_from': '', 'date_end': '9999-12-31'}),
+    'history': (_HISTORY_SQL, {'date_from': '', 'date_end': '9999-12-31', 'limit': 1}),
+    'topic sentiment': (_TOPIC_SENTIMENT_SQL, {'date_from': '', 'date_end': '9999-12-31', 'industry': None}),
+}
+
+# Upper bound on analyses the background writer commits in one transaction
+_WRITER_BATCH_SIZE = 100
+
+# Rows sampled per index by ANALYZE / PRAGMA optimize
+_ANALYSIS_LIMIT = 1000
+
+_SENTIMENT_LABELS = ('positive', 'neutral', 'negative')
+
+# Columns get_analysis_result(fields=...) may select, and how their stored values are decoded
+_VALID_FIELDS = frozenset((
+    'analysis_id', 'user_id', 'processed_at', 'source_file', 'industry', 'duration', 'participants',
+    'sentiment', 'transcription_text', 'transcription_confidence', 'transcription_language',
+    'conversation_data', 'intents_data', 'overall_sentiment_label', 'overall_sentiment_score',
+    'participant_sentiments', 'topics_data', 'summary', 'quality_score', 'insights', 'file_path',
+    'created_at', 'updated_at'
+))
+_JSON_FIELDS = frozenset(('conversation_data', 'intents_data', 'participant_sentiments', 'topics_data', 'insights'))
+_COMPRESSED_FIELDS = frozenset(('transcription_text', 'conversation_data'))
+
+# Columns stored in analysis_results_blobs rather than analysis_results
+_BLOB_COLUMNS = ('transcription_text', 'conversation_data', 'insights')
+
+# Statement cache per connection; the default of 100 is shared with every dashboard variant
+_CACHED_STATEMENTS = 256
+
+@functools.lru_cache(maxsize=64)
+def _select_fields_sql(fields: tuple) -> str:
+    """SQL selecting `fields` of one analysis, joining the blobs table only when needed."""
+    source = _ANALYSIS_FROM if any(field in _BLOB_COLUMNS for field in fields) else 'analysis_results'
+    return f"SELECT {', '.join(fields)} FROM {source} WHERE analysis_id = ?"
+
+def _cached_aggregate(method):
+    """Memoize a read-only aggregate for a short TTL, keyed by its arguments.
+
+    Keys include the write generation, so results computed before a write
+    are never served after it. Error results are not cached.
+    """
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, self._cache_generation, *list(bound.arguments.values())[1:])
+        with self._cache_lock:
+            cached = self._aggregate_cache.get(key)
+            if cached is None:
+                self._cache_misses += 1
+            else:
+                self._cache_hits += 1
+        if cached is not None:
+            return cached
+        result = method(self, *args, **kwargs)
+        if result and 'error' not in result:
+            with self._cache_lock:
+                self._aggregate_cache[key] = result
+        return result
+    return wrapper
+
+def _day_after(day: str) -> str:
+    """Return the ISO date following `day`, for half-open processed_at ranges."""
+    return (date.fromisoformat(day[:10]) + timedelta(days=1)).isoformat()
+
+# Bounds bound in place of a missing date filter, so the filtered queries keep one fixed SQL text
+_MIN_DAY = ''
+_MAX_DAY = '9999-12-31'
+
+def _filter_params(date_from: Optional[str], date_to: Optional[str], industry: Optional[str]) -> Dict[str, Any]:
+    """Named parameters for the fixed dashboard filter: processed_at in [date_from, day after date_to), industry."""
+    return {
+        'date_from': date_from[:10] if date_from else _MIN_DAY,
+        'date_end': _day_after(date_to) if date_to else _MAX_DAY,
+        'industry': industry if industry and industry.lower() != 'all' else None,
+        'has_dates': bool(date_from or date_to),
+    }
 
 class CallAnalyzerDB:
     def __init__(self, db_path: str = "call_analyzer.db"):
         """Initialize database connection and create tables if they don't exist."""
         self.db_path = db_path
+        # SQLite allows a single writer; writes share one connection behind this lock
+        self._write_lock = threading.Lock()
+        self._write_conn = None
+        # Read connections are opened once per thread and reused across calls
+        self._local = threading.local()
+        # Short-lived cache for dashboard and per-user aggregates, invalidated by bumping the generation on writes
+        self._aggregate_cache = TTLCache(maxsize=256, ttl=30)
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Analyses are serialized and inserted by one background writer thread, started on first use
+        self._write_queue = queue.Queue()
+        self._writer_thread = None
+        self._writer_start_lock = threading.Lock()
         self.init_database()
     
     def init_database(self):
         """Create database tables if they don't exist."""
-        with self.get_connection() as conn:
+        with self.get_write_connection() as conn:
             cursor = conn.cursor()
             
+            # WAL lets readers run alongside the single writer; it persists in the file
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
+            # Tables are STRICT (INTEGER/REAL/TEXT/ANY only, no per-cell affinity guessing).
+            # Timestamps are TEXT: CURRENT_TIMESTAMP defaults are 'YYYY-MM-DD HH:MM:SS' (UTC),
+            # processed_at is the naive ISO-8601 string supplied by the pipeline
+            
             # Create users table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id TEXT PRIMARY KEY,
-                    username TEXT NOT NULL,
-                    email TEXT,
-                    full_name TEXT,
-                    department TEXT,
-                    role TEXT DEFAULT 'user',
-                    is_active BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+            self._create_strict_table(cursor, 'users', '''
+                user_id TEXT PRIMARY KEY,
+                username TEXT NOT NULL,
+                email TEXT,
+                full_name TEXT,
+                department TEXT,
+                role TEXT DEFAULT 'user',
+                is_active INTEGER DEFAULT 1,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
             ''')
             
+            # Bulky columns only the detail views read, kept 1:1 beside analysis_results so
+            # aggregate scans stay on small rows; ANY because large values are zlib BLOBs
+            self._create_strict_table(cursor, 'analysis_results_blobs', '''
+                analysis_id TEXT PRIMARY KEY,
+                transcription_text ANY,
+                conversation_data ANY, -- JSON string
+                insights TEXT -- JSON string
+            ''')
+            
+            # Move the bulky columns out of databases created before the split
+            cursor.execute('PRAGMA table_info(analysis_results)')
+            if 'conversation_data' in {column[1] for column in cursor.fetchall()}:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO analysis_results_blobs
+                    SELECT analysis_id, transcription_text, conversation_data, insights FROM analysis_results
+                ''')
+                for column in _BLOB_COLUMNS:
+                    cursor.execute(f'ALTER TABLE analysis_results DROP COLUMN {column}')
+            
+            # Sentiment is stored lowercase and limited to the three labels; normalize older rows
+            # first so the rebuilt table's CHECK accepts them
+            sentiments_normalized = False
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'analysis_results'")
+            if cursor.fetchone():
+                cursor.execute('''
+                    UPDATE analysis_results
+                    SET sentiment = CASE WHEN LOWER(sentiment) IN ('positive', 'neutral', 'negative')
+                                         THEN LOWER(sentiment) ELSE 'neutral' END
+                    WHERE sentiment IS NULL OR sentiment NOT IN ('positive', 'neutral', 'negative')
+                ''')
+                sentiments_normalized = cursor.rowcount > 0
+            
             # Create analysis_results table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS analysis_results (
-                    analysis_id TEXT PRIMARY KEY,
-                    user_id TEXT NOT NULL DEFAULT 'default_user',
-                    processed_at TEXT NOT NULL,
-                    source_file TEXT NOT NULL,
-                    industry TEXT NOT NULL CHECK (industry IN ('eCommerce', 'Telecom', 'Healthcare', 'Travel', 'Real Estate', 'Customer Service', 'Insurance')),
-                    duration REAL DEFAULT 0.0,
-                    participants INTEGER DEFAULT 0,
-                    sentiment TEXT DEFAULT 'neutral',
-                    transcription_text TEXT,
-                    transcription_confidence REAL DEFAULT 0.0,
-                    transcription_language TEXT DEFAULT 'en-US',
-                    conversation_data TEXT, -- JSON string
-                    intents_data TEXT, -- JSON string
-                    overall_sentiment_label TEXT DEFAULT 'neutral',
-                    overall_sentiment_score REAL DEFAULT 0.0,
-                    participant_sentiments TEXT, -- JSON string
-                    topics_data TEXT, -- JSON string
-                    summary TEXT,
-                    quality_score REAL DEFAULT 0.0,
-                    insights TEXT, -- JSON string
-                    file_path TEXT, 
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+            self._create_strict_table(cursor, 'analysis_results', '''
+                analysis_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL DEFAULT 'default_user',
+                processed_at TEXT NOT NULL,
+                source_file TEXT NOT NULL,
+                industry TEXT NOT NULL CHECK (industry IN ('eCommerce', 'Telecom', 'Healthcare', 'Travel', 'Real Estate', 'Customer Service', 'Insurance')),
+                duration REAL DEFAULT 0.0,
+                participants INTEGER DEFAULT 0,
+                sentiment TEXT NOT NULL DEFAULT 'neutral' CHECK (sentiment IN ('positive', 'neutral', 'negative')),
+                transcription_confidence REAL DEFAULT 0.0,
+                transcription_language TEXT DEFAULT 'en-US',
+                intents_data TEXT, -- JSON string
+                overall_sentiment_label TEXT DEFAULT 'neutral',
+                overall_sentiment_score REAL DEFAULT 0.0,
+                participant_sentiments TEXT, -- JSON string
+                topics_data TEXT, -- JSON string
+                summary TEXT,
+                quality_score REAL DEFAULT 0.0,
+                file_path TEXT, 
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
             ''')
             
             # Create processing_status table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS processing_status (
-                    analysis_id TEXT PRIMARY KEY,
-                    status TEXT NOT NULL,
-                    progress INTEGER DEFAULT 0,
-                    message TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (analysis_id) REFERENCES analysis_results (analysis_id)
-                )
+            self._create_strict_table(cursor, 'processing_status', '''
+                analysis_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                progress INTEGER DEFAULT 0,
+                message TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (analysis_id) REFERENCES analysis_results (analysis_id)
+            ''')
+            
+            # Per-user daily sentiment rollup, kept in step with analysis_results by save_analysis_result
+            self._create_strict_table(cursor, 'user_sentiment_daily', '''
+                user_id TEXT NOT NULL,
+                date TEXT,
+                industry TEXT NOT NULL,
+                total_calls INTEGER DEFAULT 0,
+                positive_count INTEGER DEFAULT 0,
+                negative_count INTEGER DEFAULT 0,
+                neutral_count INTEGER DEFAULT 0,
+                sum_quality REAL DEFAULT 0.0,
+                cnt_quality INTEGER DEFAULT 0,
+                sum_duration REAL DEFAULT 0.0,
+                PRIMARY KEY (user_id, date, industry)
+            ''')
+            
+            # Backfill the rollup for databases created before it existed, and rebuild it
+            # if the sentiment normalization above changed any counted rows
+            cursor.execute('SELECT EXISTS(SELECT 1 FROM user_sentiment_daily)')
+            if sentiments_normalized or not cursor.fetchone()[0]:
+                cursor.execute('DELETE FROM user_sentiment_daily')
+                cursor.execute('''
+                    INSERT INTO user_sentiment_daily
+                    SELECT user_id, DATE(processed_at), industry, COUNT(*),
+                           COUNT(*) FILTER (WHERE sentiment = 'positive'),
+                           COUNT(*) FILTER (WHERE sentiment = 'negative'),
+                           COUNT(*) FILTER (WHERE sentiment = 'neutral'),
+                           TOTAL(quality_score), COUNT(quality_score), TOTAL(duration)
+                    FROM analysis_results
+                    GROUP BY user_id, DATE(processed_at), industry
+                ''')
+            
+            # Per-day topic rollup read by get_topic_statistics, maintained alongside user_sentiment_daily
+            topic_table_built = self._create_strict_table(cursor, 'topic_stats_daily', '''
+                date TEXT,
+                industry TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                conversations INTEGER DEFAULT 0,
+                mentions INTEGER DEFAULT 0,
+                sum_score REAL DEFAULT 0.0,
+                dominant_mentions INTEGER DEFAULT 0,
+                PRIMARY KEY (date, industry, topic)
             ''')
+            # Fill the rollup whenever its table is new or its definition changed
+            if topic_table_built:
+                cursor.execute('DELETE FROM topic_stats_daily')
+                cursor.execute(_TOPIC_ROLLUP_SQL.format(where='true'), {'sign': 1})
             
             # Create indexes for better performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_processed_at ON analysis_results(processed_at)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_industry ON analysis_results(industry)')
+            # Covering indexes: dashboard and per-user reads are answered from the index alone
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_ar_processed_industry_cov ON analysis_results(
+                    processed_at DESC, industry, sentiment, quality_score, duration, participants, user_id, analysis_id
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_ar_user_processed ON analysis_results(
+                    user_id, processed_at, sentiment, quality_score, duration
+                )
+            ''')
+            # Topic statistics filter by industry, optionally with a date range
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ar_industry_processed ON analysis_results(industry, processed_at)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_sentiment ON analysis_results(sentiment)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_id ON analysis_results(user_id)')
+            # Superseded by the covering indexes above
+            cursor.execute('DROP INDEX IF EXISTS idx_processed_at')
+            cursor.execute('DROP INDEX IF EXISTS idx_industry')
+            cursor.execute('DROP INDEX IF EXISTS idx_user_id')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_status ON processing_status(status)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_username ON users(username)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_active ON users(is_active)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_usd_date ON user_sentiment_daily(date)')
             
             conn.commit()
             
-            # Insert default users if table is empty
-            self._insert_default_users()
+            # Refresh planner statistics; the limit keeps this cheap on large tables
+            cursor.execute(f'PRAGMA analysis_limit = {_ANALYSIS_LIMIT}')
+            cursor.execute('ANALYZE')
+            self._check_query_plans(cursor)
+            
+        # Insert default users if table is empty
+        self._insert_default_users()
+    
+    def _check_query_plans(self, cursor):
+        """Log a warning for each _PLAN_CHECKS statement that plans as a full scan of analysis_results."""
+        for name, (sql, params) in _PLAN_CHECKS.items():
+            try:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                scans = [row[3] for row in cursor.fetchall() if row[3].startswith('SCAN analysis_results')]
+            except sqlite3.Error as e:
+                log.warning("Could not check the query plan for %s: %s", name, e)
+                continue
+            if scans:
+                log.warning("Query plan regression: %s query does %s", name, '; '.join(scans))
+    
+    def _create_strict_table(self, cursor, name: str, columns: str) -> bool:
+        """Create `name` as a STRICT table, rebuilding an existing one with its data if its definition differs.
+        
+        Returns True if the table was created or rebuilt.
+        """
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+        existing = cursor.fetchone()
+        if existing:
+            current = ' '.join(existing[0].split())
+            if current.endswith(' STRICT') and ' '.join(f'({columns})'.split()) in current:
+                return False
+        
+        target = f'{name}_strict' if existing else name
+        cursor.execute(f'CREATE TABLE {target} ({columns}) STRICT')
+        if existing:
+            # Copy the columns both versions share; indexes are recreated by init_database
+            cursor.execute(f'PRAGMA table_info({name})')
+            old_columns = {column[1] for column in cursor.fetchall()}
+            cursor.execute(f'PRAGMA table_info({target})')
+            shared = ', '.join(column[1] for column in cursor.fetchall() if column[1] in old_columns)
+            cursor.execute(f'INSERT INTO {target} ({shared}) SELECT {shared} FROM {name}')
+            cursor.execute(f'DROP TABLE {name}')
+            cursor.execute(f'ALTER TABLE {target} RENAME TO {name}')
+        return True
+    
+    def _open_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a tuned connection; read-only ones never contend for SQLite's write lock."""
+        if read_only:
+            conn = sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True,
+                                   cached_statements=_CACHED_STATEMENTS)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        # Per-connection tuning: WAL-safe sync level, in-memory temp tables, mmap reads, 64MB page cache
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA cache_size=-65536')
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+    
+    def _read_connection(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open_connection(read_only=True)
+            self._local.conn = conn
+        return conn
+    
+    def _invalidate_aggregates(self):
+        """Make cached dashboard aggregates unreachable after a write."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._aggregate_cache.clear()
+    
+    def get_cache_info(self) -> Dict[str, int]:
+        """Hit/miss counters and occupancy of the aggregate cache."""
+        with self._cache_lock:
+            return {
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'size': len(self._aggregate_cache),
+                'maxsize': int(self._aggregate_cache.maxsize),
+                'generation': self._cache_generation
+            }
     
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Context manager for this thread's cached read-only connection (not closed on exit)."""
+        yield self._read_connection()
+    
+    @contextmanager
+    def get_write_connection(self):
+        """Context manager for the shared write connection, held under the write lock."""
+        with self._write_lock:
+            if self._write_conn is None:
+                self._write_conn = self._open_connection()
+            try:
+                yield self._write_conn
+            except BaseException:
+                self._write_conn.rollback()
+                raise
+    
+    def _analysis_row(self, analysis_data: Dict[str, Any]) -> Optional[tuple]:
+        """Validate one analysis and build its (_INSERT_ANALYSIS_SQL, _INSERT_BLOBS_SQL) parameters; None if invalid."""
+        # Extract data from analysis_data
+        analysis_id = analysis_data.get('analysis_id')
+        user_id = analysis_data.get('user_id', 'default_user')
+        processed_at = analysis_data.get('processed_at')
+        source_file = analysis_data.get('source_file')
+        industry = analysis_data.get('industry')
+        duration = analysis_data.get('duration', 0.0)
+        participants = analysis_data.get('participants', 0)
+        # Stored lowercase; labels outside the three count as neutral, as in SentimentAnalyzer
+        sentiment = (analysis_data.get('sentiment') or 'neutral').lower()
+        if sentiment not in _SENTIMENT_LABELS:
+            sentiment = 'neutral'
+
+        # Validate required fields
+        if not analysis_id:
+            print(f"[ERROR] Missing analysis_id")
+            return None
+        if not processed_at:
+            print(f"[ERROR] Missing processed_at")
+            return None
+        if not source_file:
+            print(f"[ERROR] Missing source_file")
+            return None
+        if not industry:
+            print(f"[ERROR] Missing industry")
+            return None
+
+        # Validate industry constraint
+        valid_industries = ['eCommerce', 'Telecom', 'Healthcare', 'Travel', 'Real Estate', 'Customer Service', 'Insurance']
+        if industry not in valid_industries:
+            print(f"[ERROR] Invalid industry '{industry}'. Must be one of: {valid_industries}")
+            return None
+
+        # Transcription data
+        transcription = analysis_data.get('transcription', {})
+        transcription_text = transcription.get('full_text', '')
+        transcription_confidence = transcription.get('confidence', 0.0)
+        transcription_language = transcription.get('language', 'en-US')
+
+        # Conversation data
+        conversation_data = _dumps(analysis_data.get('conversation', []))
+
+        # Analysis data
+        analysis = analysis_data.get('analysis', {})
+        intents_data = _dumps(analysis.get('intents', []))                 
+        overall_sentiment = analysis.get('overall_sentiment', {})
+        overall_sentiment_label = overall_sentiment.get('label', 'neutral')
+        overall_sentiment_score = overall_sentiment.get('score', 0.0)
+
+        participant_sentiments = _dumps(analysis.get('participant_sentiments', []))
+        topics_data = _dumps(analysis.get('topic_analysis', {}))
+        qualityMetrics = analysis.get('quality_metrics', {})                 
+        summary = analysis.get('conversation_summary', '')
+        quality_score = qualityMetrics.get('overall_score', 0.0)
+        insights = _dumps(analysis.get('insights', []))
+
+
+        if duration == 0.0 and len(transcription_text) == 0 and len(conversation_data) <= 2:
+            print(f"[WARNING] Saving analysis with empty/incomplete data:")
+
+        # File paths (if available)
+        file_path = analysis_data.get('file_path', '')
+
+        # Transcript and conversation are the largest columns and are only read back whole
+        transcription_text = _compress(transcription_text)
+        conversation_data = _compress(conversation_data)
+
+        return (
+            (
+                analysis_id, user_id, processed_at, source_file, industry, duration, participants,
+                sentiment, transcription_confidence, transcription_language,
+                intents_data, overall_sentiment_label, overall_sentiment_score,
+                participant_sentiments, topics_data, summary, quality_score, file_path
+            ),
+            (analysis_id, transcription_text, conversation_data, insights)
+        )
     
     def save_analysis_result(self, analysis_data: Dict[str, Any]) -> bool:
         """Save complete analysis result to database."""
+        return self.submit_analysis_result(analysis_data).result()
+    
+    def submit_analysis_result(self, analysis_data: Dict[str, Any]) -> Future:
+        """Queue an analysis for the background writer; the Future resolves to whether it was saved."""
+        log.debug("save_analysis_result called with analysis_id: %s", analysis_data.get('analysis_id'))
+        future = Future()
+        with self._writer_start_lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+                self._writer_thread.start()
+        self._write_queue.put((analysis_data, future))
+        return future
+    
+    def _writer_loop(self):
+        """Serialize and insert queued analyses, committing everything queued so far as one batch."""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < _WRITER_BATCH_SIZE:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            saved = []
+            rows = []
+            for analysis_data, future in batch:
+                try:
+                    row = self._analysis_row(analysis_data)
+                except Exception as e:
+                    print(f"[ERROR] Error preparing analysis result: {e}")
+                    row = None
+                if row is None:
+                    print(f"[ERROR] Analysis ID: {analysis_data.get('analysis_id', 'UNKNOWN')} skipped")
+                    future.set_result(False)
+                else:
+                    rows.append(row)
+                    saved.append(future)
+            
+            if rows:
+                if self._write_analysis_rows(rows):
+                    for future in saved:
+                        future.set_result(True)
+                elif len(rows) == 1:
+                    saved[0].set_result(False)
+                else:
+                    # One bad row rolls back the whole batch; retry each on its own so
+                    # every caller learns whether its own analysis was stored
+                    print(f"[WARNING] Batch of {len(rows)} analyses failed, retrying one at a time")
+                    for row, future in zip(rows, saved):
+                        future.set_result(self._write_analysis_rows([row]))
+    
+    def save_analysis_results_bulk(self, analyses: List[Dict[str, Any]]) -> int:
+        """Save several analysis results in one transaction; returns how many were saved."""
+        rows = []
+        for analysis_data in analyses:
+            row = self._analysis_row(analysis_data)
+            if row is None:
+                print(f"[ERROR] Analysis ID: {analysis_data.get('analysis_id', 'UNKNOWN')} skipped")
+                continue
+            rows.append(row)
+        if not rows or not self._write_analysis_rows(rows):
+            return 0
+        self._refresh_statistics()
+        return len({row[0][0] for row in rows})
+    
+    def _refresh_statistics(self):
+        """Let SQLite re-analyze tables whose statistics a bulk load has made stale."""
+        try:
+            with self.get_write_connection() as conn:
+                conn.execute(f'PRAGMA analysis_limit = {_ANALYSIS_LIMIT}')
+                conn.execute('PRAGMA optimize')
+        except Exception as e:
+            print(f"Error refreshing planner statistics: {e}")
+    
+    def _write_analysis_rows(self, rows: List[tuple]) -> bool:
+        """Insert prepared analysis rows and update the rollup in one transaction."""
         try:
-            print(f"[DEBUG] save_analysis_result called with analysis_id: {analysis_data.get('analysis_id')}")
+            # A later duplicate ID wins, as with sequential saves
+            rows = list({row[0][0]: row for row in rows}.values())
+            blob_rows = [row[1] for row in rows]
+            rows = [row[0] for row in rows]
             
-            with self.get_connection() as conn:
+            log.debug("About to insert %d analysis result(s)...", len(rows))
+            
+            with self.get_write_connection() as conn:
                 cursor = conn.cursor()
+                cursor.execute('BEGIN IMMEDIATE')
                 
-                # Extract data from analysis_data
-                analysis_id = analysis_data.get('analysis_id')
-                user_id = analysis_data.get('user_id', 'default_user')
-                processed_at = analysis_data.get('processed_at')
-                source_file = analysis_data.get('source_file')
-                industry = analysis_data.get('industry')
-                duration = analysis_data.get('duration', 0.0)
-                participants = analysis_data.get('participants', 0)
-                sentiment = analysis_data.get('sentiment', 'neutral')   
-                
-                # Validate required fields
-                if not analysis_id:
-                    print(f"[ERROR] Missing analysis_id")
-                    return False
-                if not processed_at:
-                    print(f"[ERROR] Missing processed_at")
-                    return False
-                if not source_file:
-                    print(f"[ERROR] Missing source_file")
-                    return False
-                if not industry:
-                    print(f"[ERROR] Missing industry")
-                    return False
-                
-                # Validate industry constraint
-                valid_industries = ['eCommerce', 'Telecom', 'Healthcare', 'Travel', 'Real Estate', 'Customer Service', 'Insurance']
-                if industry not in valid_industries:
-                    print(f"[ERROR] Invalid industry '{industry}'. Must be one of: {valid_industries}")
-                    return False
-                
-                # Transcription data
-                transcription = analysis_data.get('transcription', {})
-                transcription_text = transcription.get('full_text', '')
-                transcription_confidence = transcription.get('confidence', 0.0)
-                transcription_language = transcription.get('language', 'en-US')
-                
-                # Conversation data
-                conversation_data = json.dumps(analysis_data.get('conversation', []))
-                
-                # Analysis data
-                analysis = analysis_data.get('analysis', {})
-                intents_data = json.dumps(analysis.get('intents', []))                 
-                overall_sentiment = analysis.get('overall_sentiment', {})
-                overall_sentiment_label = overall_sentiment.get('label', 'neutral')
-                overall_sentiment_score = overall_sentiment.get('score', 0.0)
-                
-                participant_sentiments = json.dumps(analysis.get('participant_sentiments', []))
-                topics_data = json.dumps(analysis.get('topic_analysis', {}))
-                qualityMetrics = analysis.get('quality_metrics', {})                 
-                summary = analysis.get('conversation_summary', '')
-                quality_score = qualityMetrics.get('overall_score', 0.0)
-                insights = json.dumps(analysis.get('insights', []))
-                
-                
-                if duration == 0.0 and len(transcription_text) == 0 and len(conversation_data) <= 2:
-                    print(f"[WARNING] Saving analysis with empty/incomplete data:")
-                
-                # File paths (if available)
-                file_path = analysis_data.get('file_path', '')
-                
-                print(f"[DEBUG] About to execute INSERT query...")
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO analysis_results (
-                        analysis_id, user_id, processed_at, source_file, industry, duration, participants,
-                        sentiment, transcription_text, transcription_confidence, transcription_language,
-                        conversation_data, intents_data, overall_sentiment_label, overall_sentiment_score,
-                        participant_sentiments, topics_data, summary, quality_score, insights, file_path
-                    ) VALUES (
-                        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-                    )
-                ''', (
-                    analysis_id, user_id, processed_at, source_file, industry, duration, participants,
-                    sentiment, transcription_text, transcription_confidence, transcription_language,
-                    conversation_data, intents_data, overall_sentiment_label, overall_sentiment_score,
-                    participant_sentiments, topics_data, summary, quality_score, insights, file_path
-                ))
-                
-                print(f"[DEBUG] INSERT executed, about to commit...")
+                # Re-saved analyses overwrite their row, so take the old values out of the rollup first
+                placeholders = ', '.join('?' * len(rows))
+                cursor.execute(f'''
+                    SELECT user_id, processed_at, industry, sentiment, quality_score, duration
+                    FROM analysis_results WHERE analysis_id IN ({placeholders})
+                ''', [row[0] for row in rows])
+                previous = cursor.fetchall()
+                if previous:
+                    self._update_sentiment_rollup(cursor, previous, sign=-1)
+                    self._update_topic_rollup(cursor, [row[0] for row in rows], sign=-1)
+                
+                if _JSON_INSERT_MIN_ROWS is not None and len(rows) >= _JSON_INSERT_MIN_ROWS:
+                    cursor.execute(_INSERT_ANALYSIS_JSON_SQL, (_dumps(rows),))
+                else:
+                    cursor.executemany(_INSERT_ANALYSIS_SQL, rows)
+                # Blob rows may hold compressed bytes, which JSON cannot carry
+                cursor.executemany(_INSERT_BLOBS_SQL, blob_rows)
+                self._update_sentiment_rollup(cursor, [
+                    (row[1], row[2], row[4], row[7], row[16], row[5]) for row in rows
+                ])
+                self._update_topic_rollup(cursor, [row[0] for row in rows])
+                
+                log.debug("INSERT executed, about to commit...")
                 conn.commit()
-                print(f"[DEBUG] Successfully saved analysis result for ID: {analysis_id}")
+                self._invalidate_aggregates()
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("Successfully saved analysis results for IDs: %s", ', '.join(row[0] for row in rows))
                 return True
             
         except sqlite3.IntegrityError as e:
             print(f"[ERROR] Database integrity error: {e}")
-            print(f"[ERROR] Analysis ID: {analysis_data.get('analysis_id', 'UNKNOWN')}")
-            print(f"[ERROR] Industry: {analysis_data.get('industry', 'UNKNOWN')}")
             return False
         except sqlite3.Error as e:
             print(f"[ERROR] Database error: {e}")
-            print(f"[ERROR] Analysis ID: {analysis_data.get('analysis_id', 'UNKNOWN')}")
             import traceback
             traceback.print_exc()
             return False
         except Exception as e:
-            print(f"[ERROR] Error saving analysis result: {e}")
-            print(f"[ERROR] Analysis ID: {analysis_data.get('analysis_id', 'UNKNOWN')}")
-            print(f"[ERROR] Industry: {analysis_data.get('industry', 'UNKNOWN')}")
+            print(f"[ERROR] Error saving analysis results: {e}")
             import traceback
             traceback.print_exc()
             return False
     
-    def get_analysis_result(self, analysis_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve analysis result by ID."""
+    def _update_sentiment_rollup(self, cursor, analyses, sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) analyses from user_sentiment_daily.
+
+        Each entry is (user_id, processed_at, industry, sentiment, quality_score, duration).
+        """
+        params = []
+        for user_id, processed_at, industry, sentiment, quality_score, duration in analyses:
+            params.append((
+                user_id, processed_at, industry, sign,
+                sign * (sentiment == 'positive'), sign * (sentiment == 'negative'), sign * (sentiment == 'neutral'),
+                sign * (quality_score or 0.0), sign * (quality_score is not None), sign * (duration or 0.0)
+            ))
+        cursor.executemany('''
+            INSERT INTO user_sentiment_daily (
+                user_id, date, industry, total_calls, positive_count, negative_count,
+                neutral_count, sum_quality, cnt_quality, sum_duration
+            ) VALUES (?, DATE(?), ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, date, industry) DO UPDATE SET
+                total_calls = total_calls + excluded.total_calls,
+                positive_count = positive_count + excluded.positive_count,
+                negative_count = negative_count + excluded.negative_count,
+                neutral_count = neutral_count + excluded.neutral_count,
+                sum_quality = sum_quality + excluded.sum_quality,
+                cnt_quality = cnt_quality + excluded.cnt_quality,
+                sum_duration = sum_duration + excluded.sum_duration
+        ''', params)
+    
+    def _update_topic_rollup(self, cursor, analysis_ids: List[str], sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) the stored topics of `analysis_ids` from topic_stats_daily."""
+        cursor.execute(
+            _TOPIC_ROLLUP_SQL.format(where='analysis_id IN (SELECT value FROM json_each(:ids))'),
+            {'sign': sign, 'ids': _dumps(analysis_ids)}
+        )
+    
+    def get_analysis_result(self, analysis_id: str, *, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Retrieve analysis result by ID.
+        
+        With `fields`, only those columns are read and returned as a flat dict; JSON and
+        compressed columns not requested are never decoded.
+        """
+        if fields is not None:
+            fields = tuple(dict.fromkeys(fields))
+            invalid = [field for field in fields if field not in _VALID_FIELDS]
+            if invalid or not fields:
+                raise ValueError(f"Invalid analysis fields: {invalid or 'none requested'}")
+        
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('SELECT * FROM analysis_results WHERE analysis_id = ?', (analysis_id,))
-                row = cursor.fetchone()
+                if fields is None:
+                    cursor.execute(_GET_ANALYSIS_SQL, (analysis_id,))
+                    row = cursor.fetchone()
+                    
+                    if row:
+                        return self._row_to_analysis_dict(row)
+                    return None
                 
-                if row:
-                    return self._row_to_analysis_dict(row)
-                return None
+                cursor.row_factory = None
+                cursor.execute(_select_fields_sql(fields), (analysis_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                
+                result = {}
+                for field, value in zip(fields, row):
+                    if field in _COMPRESSED_FIELDS:
+                        value = _decompress(value)
+                    if field in _JSON_FIELDS:
+                        value = orjson.loads(value) if value else []
+                    result[field] = value
+                return result
                 
         except Exception as e:
             print(f"Error retrieving analysis result: {e}")
@@ -233,8 +911,8 @@ class CallAnalyzerDB:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM analysis_results 
+                cursor.execute(f'''
+                    SELECT * FROM {_ANALYSIS_FROM}
                     ORDER BY processed_at DESC 
                     LIMIT ? OFFSET ?
                 ''', (limit, offset))
@@ -246,6 +924,30 @@ class CallAnalyzerDB:
             print(f"Error retrieving analysis results: {e}")
             return []
 
+    def get_analysis_summaries(self, user_id: Optional[str] = None, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get the listing fields of analysis results, optionally for one user, newest first."""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                query = f'''
+                    SELECT {', '.join(_SUMMARY_COLUMNS)}
+                    FROM analysis_results 
+                '''
+                params = []
+                if user_id:
+                    query += "WHERE user_id = ? "
+                    params.append(user_id)
+                query += "ORDER BY processed_at DESC LIMIT ? OFFSET ?"
+                params.extend([limit, offset])
+                
+                cursor.execute(query, params)
+                return [dict(zip(_SUMMARY_COLUMNS, row)) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            print(f"Error retrieving analysis summaries: {e}")
+            return []
+
     def _row_to_analysis_dict(self, row) -> Dict[str, Any]:
         """Convert database row to analysis dictionary format."""
         try:
@@ -258,23 +960,53 @@ class CallAnalyzerDB:
                 "participants": row['participants'],
                 "sentiment": row['sentiment'],
                 "transcription": {
-                    "full_text": row['transcription_text'],
+                    "full_text": _decompress(row['transcription_text']),
                     "confidence": row['transcription_confidence'],
                     "language": row['transcription_language'],
                     "duration": row['duration']
                 },
-                "conversation": json.loads(row['conversation_data']) if row['conversation_data'] else [],
+                "conversation": orjson.loads(_decompress(row['conversation_data'])) if row['conversation_data'] else [],
+                "analysis": {
+                    "intents": orjson.loads(row['intents_data']) if row['intents_data'] else [],
+                    "overall_sentiment": {
+                        "label": row['overall_sentiment_label'],
+                        "score": row['overall_sentiment_score']
+                    },
+                    "participant_sentiments": orjson.loads(row['participant_sentiments']) if row['participant_sentiments'] else [],
+                    "topics": orjson.loads(row['topics_data']) if row['topics_data'] else [],
+                    "summary": row['summary'],
+                    "quality_score": row['quality_score'],
+                    "insights": orjson.loads(row['insights']) if row['insights'] else [],
+                    "sentiment": row['sentiment']  # For toLowerCase compatibility
+                },
+                "file_path": row['file_path']
+            }
+        except Exception as e:
+            print(f"Error converting row to dict: {e}")
+            return {}
+    
+    def _row_to_listing_dict(self, row) -> Dict[str, Any]:
+        """Convert a _LISTING_COLUMNS row to the analysis dictionary layout, without the bulky fields.
+
+        Use get_analysis_result for the transcript, conversation, topics and insights.
+        """
+        try:
+            return {
+                "analysis_id": row['analysis_id'],
+                "processed_at": row['processed_at'],
+                "source_file": row['source_file'],
+                "industry": row['industry'],
+                "duration": row['duration'],
+                "participants": row['participants'],
+                "sentiment": row['sentiment'],
                 "analysis": {
-                    "intents": json.loads(row['intents_data']) if row['intents_data'] else [],
+                    "intents": orjson.loads(row['intents_data']) if row['intents_data'] else [],
                     "overall_sentiment": {
                         "label": row['overall_sentiment_label'],
                         "score": row['overall_sentiment_score']
                     },
-                    "participant_sentiments": json.loads(row['participant_sentiments']) if row['participant_sentiments'] else [],
-                    "topics": json.loads(row['topics_data']) if row['topics_data'] else [],
                     "summary": row['summary'],
                     "quality_score": row['quality_score'],
-                    "insights": json.loads(row['insights']) if row['insights'] else [],
                     "sentiment": row['sentiment']  # For toLowerCase compatibility
                 },
                 "file_path": row['file_path']
@@ -288,34 +1020,13 @@ class CallAnalyzerDB:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None
                 
-                # Build query with optional date filters
-                query = '''
-                    SELECT analysis_id, processed_at, source_file, industry, duration, 
-                           participants, sentiment, summary, quality_score
-                    FROM analysis_results 
-                '''
-                params = []
-                
-                # Add date filters if provided
-                where_conditions = []
-                if date_from:
-                    where_conditions.append("DATE(processed_at) >= ?")
-                    params.append(date_from)
-                if date_to:
-                    where_conditions.append("DATE(processed_at) <= ?")
-                    params.append(date_to)
-                
-                if where_conditions:
-                    query += "WHERE " + " AND ".join(where_conditions) + " "
-                
-                query += "ORDER BY processed_at DESC LIMIT ?"
-                params.append(limit)
-                
-                cursor.execute(query, params)
+                params = _filter_params(date_from, date_to, None)
+                cursor.execute(_HISTORY_SQL, {**params, 'limit': limit})
                 rows = cursor.fetchall()
                 
-                return [dict(row) for row in rows]
+                return [dict(zip(_HISTORY_COLUMNS, row)) for row in rows]
                 
         except Exception as e:
             print(f"Error retrieving analysis history: {e}")
@@ -325,13 +1036,9 @@ class CallAnalyzerDB:
     def save_processing_status(self, analysis_id: str, status: str, progress: int = 0, message: str = "") -> bool:
         """Save or update processing status."""
         try:
-            with self.get_connection() as conn:
+            with self.get_write_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO processing_status (
-                        analysis_id, status, progress, message
-                    ) VALUES (?, ?, ?, ?)
-                ''', (analysis_id, status, progress, message))
+                cursor.execute(_SAVE_STATUS_SQL, (analysis_id, status, progress, message))
                 
                 conn.commit()
                 return True
@@ -345,7 +1052,7 @@ class CallAnalyzerDB:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('SELECT * FROM processing_status WHERE analysis_id = ?', (analysis_id,))
+                cursor.execute(_GET_STATUS_SQL, (analysis_id,))
                 row = cursor.fetchone()
                 
                 if row:
@@ -357,146 +1064,90 @@ class CallAnalyzerDB:
             return None
     
     
+    @_cached_aggregate
     def get_database_stats(self, date_from: Optional[str] = None, date_to: Optional[str] = None, industry: Optional[str] = None) -> Dict[str, Any]:
         """Get comprehensive database statistics for homepage with optional filters."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None  # Columns are read by position
                 
-                # Build WHERE clause based on filters
-                where_conditions = []
-                params = []
-                
-                if date_from:
-                    where_conditions.append("DATE(processed_at) >= ?")
-                    params.append(date_from)
-                
-                if date_to:
-                    where_conditions.append("DATE(processed_at) <= ?")
-                    params.append(date_to)
-                
-                if industry and industry.lower() != 'all':
-                    where_conditions.append("LOWER(industry) = LOWER(?)")
-                    params.append(industry)
+                # The filters are always bound (absent ones as open bounds / NULL), so the
+                # statement text never changes and stays in the statement cache
+                params = _filter_params(date_from, date_to, industry)
                 
-                where_clause = ""
-                if where_conditions:
-                    where_clause = "WHERE " + " AND ".join(where_conditions)
-                
-                stats = {}
-                
-                # Total records
-                cursor.execute(f"SELECT COUNT(*) FROM analysis_results {where_clause}", params)
-                stats['total_analyses'] = cursor.fetchone()[0]
-                
-                # Industry breakdown
-                cursor.execute(f'''
-                    SELECT industry, COUNT(*) as count, 
-                           AVG(duration) as avg_duration,
-                           SUM(CASE WHEN LOWER(sentiment) = 'positive' THEN 1 ELSE 0 END) as positive_count,
-                           SUM(CASE WHEN LOWER(sentiment) = 'neutral' THEN 1 ELSE 0 END) as neutral_count,
-                           SUM(CASE WHEN LOWER(sentiment) = 'negative' THEN 1 ELSE 0 END) as negative_count
-                    FROM analysis_results 
-                    {where_clause}
-                    GROUP BY industry
-                    ORDER BY count DESC
-                ''', params)
-                industry_stats = []
-                for row in cursor.fetchall():
-                    industry_stats.append({
-                        'industry': row[0],
-                        'count': row[1],
-                        'avg_duration': round(row[2], 2) if row[2] else 0,
-                        'positive_count': row[3],
-                        'neutral_count': row[4],
-                        'negative_count': row[5]
-                    })
-                stats['industry_breakdown'] = industry_stats
-                
-                # Sentiment distribution
-                cursor.execute(f'''
-                    SELECT sentiment, COUNT(*) as count
-                    FROM analysis_results 
-                    {where_clause}
-                    GROUP BY sentiment
-                ''', params)
-                sentiment_stats = []
-                for row in cursor.fetchall():
-                    sentiment_stats.append({
-                        'sentiment': row[0],
-                        'count': row[1]
-                    })
-                stats['sentiment_distribution'] = sentiment_stats
-                
-                # Daily activity (with date filtering)
-                daily_where = where_clause
-                daily_params = params.copy()
-                
-                # If no date filter specified, default to last 30 days
-                if not date_from and not date_to:
-                    if where_clause:
-                        daily_where += " AND processed_at >= datetime('now', '-30 days')"
-                    else:
-                        daily_where = "WHERE processed_at >= datetime('now', '-30 days')"
-                
-                cursor.execute(f'''
-                    SELECT DATE(processed_at) as date, COUNT(*) as count
-                    FROM analysis_results 
-                    {daily_where}
-                    GROUP BY DATE(processed_at)
-                    ORDER BY date DESC
-                    LIMIT 30
-                ''', daily_params)
-                daily_activity = []
-                for row in cursor.fetchall():
-                    daily_activity.append({
-                        'date': row[0],
-                        'count': row[1]
-                    })
-                stats['daily_activity'] = daily_activity
-                
-                # Quality metrics
-                cursor.execute(f'''
-                    SELECT 
-                        AVG(quality_score) as avg_quality,
-                        MIN(quality_score) as min_quality,
-                        MAX(quality_score) as max_quality,
-                        AVG(duration) as avg_duration,
-                        AVG(participants) as avg_participants,
-                        SUM(CASE WHEN LOWER(sentiment) = 'positive' THEN 1 ELSE 0 END) as total_positive,
-                        SUM(CASE WHEN LOWER(sentiment) = 'negative' THEN 1 ELSE 0 END) as total_negative
-                    FROM analysis_results
-                    {where_clause}
+                # Every section is built in one round trip over the filtered rows;
+                # list sections come back as JSON arrays
+                cursor.execute('''
+                    WITH base AS (
+                        SELECT analysis_id, processed_at, industry, sentiment, quality_score, duration, participants
+                        FROM analysis_results
+                        WHERE processed_at >= :date_from AND processed_at < :date_end
+                          AND (:industry IS NULL OR LOWER(industry) = LOWER(:industry))
+                    )
+                    SELECT
+                        (SELECT COUNT(*) FROM base),
+                        (SELECT json_group_array(json_object(
+                                    'industry', industry, 'count', count, 'avg_duration', avg_duration,
+                                    'positive_count', positive_count, 'neutral_count', neutral_count,
+                                    'negative_count', negative_count))
+                         FROM (
+                            SELECT industry, COUNT(*) as count, 
+                                   AVG(duration) as avg_duration,
+                                   COUNT(*) FILTER (WHERE sentiment = 'positive') as positive_count,
+                                   COUNT(*) FILTER (WHERE sentiment = 'neutral') as neutral_count,
+                                   COUNT(*) FILTER (WHERE sentiment = 'negative') as negative_count
+                            FROM base
+                            GROUP BY industry
+                            ORDER BY count DESC, industry
+                         )),
+                        (SELECT json_group_array(json_object('sentiment', sentiment, 'count', count))
+                         FROM (SELECT sentiment, COUNT(*) as count FROM base GROUP BY sentiment)),
+                        (SELECT json_group_array(json_object('date', date, 'count', count))
+                         FROM (
+                            SELECT DATE(processed_at) as date, COUNT(*) as count
+                            FROM base
+                            -- If no date filter specified, default to last 30 days
+                            WHERE :has_dates OR processed_at >= datetime('now', '-30 days')
+                            GROUP BY DATE(processed_at)
+                            ORDER BY date DESC
+                            LIMIT 30
+                         )),
+                        (SELECT json_group_array(json_object(
+                                    'analysis_id', analysis_id, 'processed_at', processed_at, 'industry', industry,
+                                    'sentiment', sentiment, 'quality_score', quality_score))
+                         FROM (SELECT * FROM base ORDER BY processed_at DESC LIMIT 10)),
+                        AVG(quality_score),
+                        MIN(quality_score),
+                        MAX(quality_score),
+                        AVG(duration),
+                        AVG(participants),
+                        COUNT(*) FILTER (WHERE sentiment = 'positive'),
+                        COUNT(*) FILTER (WHERE sentiment = 'negative')
+                    FROM base
                 ''', params)
                 row = cursor.fetchone()
-                stats['quality_metrics'] = {
-                    'avg_quality': round(row[0], 2) if row[0] else 0,
-                    'min_quality': round(row[1], 2) if row[1] else 0,
-                    'max_quality': round(row[2], 2) if row[2] else 0,
-                    'avg_duration': round(row[3], 2) if row[3] else 0,
-                    'avg_participants': round(row[4], 2) if row[4] else 0,
-                    'total_positive': row[5] if row[5] else 0,
-                    'total_negative': row[6] if row[6] else 0
-                }
                 
-                # Recent activity
-                cursor.execute(f'''
-                    SELECT analysis_id, processed_at, industry, sentiment, quality_score
-                    FROM analysis_results 
-                    {where_clause}
-                    ORDER BY processed_at DESC 
-                    LIMIT 10
-                ''', params)
-                recent_activity = []
-                for row in cursor.fetchall():
-                    recent_activity.append({
-                        'analysis_id': row[0],
-                        'processed_at': row[1],
-                        'industry': row[2],
-                        'sentiment': row[3],
-                        'quality_score': row[4]
-                    })
-                stats['recent_activity'] = recent_activity
+                industry_stats = orjson.loads(row[1])
+                for item in industry_stats:
+                    item['avg_duration'] = round(item['avg_duration'], 2) if item['avg_duration'] else 0
+                
+                stats = {
+                    'total_analyses': row[0],
+                    'industry_breakdown': industry_stats,
+                    'sentiment_distribution': orjson.loads(row[2]),
+                    'daily_activity': orjson.loads(row[3]),
+                    'quality_metrics': {
+                        'avg_quality': round(row[5], 2) if row[5] else 0,
+                        'min_quality': round(row[6], 2) if row[6] else 0,
+                        'max_quality': round(row[7], 2) if row[7] else 0,
+                        'avg_duration': round(row[8], 2) if row[8] else 0,
+                        'avg_participants': round(row[9], 2) if row[9] else 0,
+                        'total_positive': row[10] if row[10] else 0,
+                        'total_negative': row[11] if row[11] else 0
+                    },
+                    'recent_activity': orjson.loads(row[4])
+                }
                 
                 return stats
                 
@@ -504,62 +1155,70 @@ class CallAnalyzerDB:
             print(f"Error retrieving database stats: {e}")
             return {}
     
+    @_cached_aggregate
     def get_top_user_performance_by_sentiment(self, date_from: Optional[str] = None, date_to: Optional[str] = None, industry: Optional[str] = None) -> Dict[str, Any]:
         """Get top 5 user performance by sentiment with optional filters."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None  # Columns are read by position
                 
-                # Build WHERE clause based on filters
-                where_conditions = []
-                params = []
+                # Fixed filter over the rollup's DATE(processed_at) column; see _filter_params
+                params = _filter_params(date_from, date_to, industry)
                 
-                if date_from:
-                    where_conditions.append("DATE(ar.processed_at) >= ?")
-                    params.append(date_from)
-                
-                if date_to:
-                    where_conditions.append("DATE(ar.processed_at) <= ?")
-                    params.append(date_to)
-                
-                if industry and industry.lower() != 'all':
-                    where_conditions.append("LOWER(ar.industry) = LOWER(?)")
-                    params.append(industry)
-                
-                where_clause = ""
-                if where_conditions:
-                    where_clause = "WHERE " + " AND ".join(where_conditions)
-                
-                # Get top 5 users by positive sentiment count
-                cursor.execute(f'''
-                    SELECT 
-                        u.user_id,
-                        u.username,
-                        u.full_name,
-                        u.role,
-                        u.department,
-                        COUNT(ar.analysis_id) as total_calls,
-                        SUM(CASE WHEN LOWER(ar.sentiment) = 'positive' THEN 1 ELSE 0 END) as positive_count,
-                        SUM(CASE WHEN LOWER(ar.sentiment) = 'negative' THEN 1 ELSE 0 END) as negative_count,
-                        SUM(CASE WHEN LOWER(ar.sentiment) = 'neutral' THEN 1 ELSE 0 END) as neutral_count,
-                        AVG(ar.quality_score) as avg_quality_score,
-                        SUM(ar.duration) as total_duration,
-                        ROUND(
-                            (SUM(CASE WHEN LOWER(ar.sentiment) = 'positive' THEN 1 ELSE 0 END) * 100.0) / 
-                            NULLIF(COUNT(ar.analysis_id), 0), 2
-                        ) as positive_percentage
-                    FROM users u
-                    LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                    {where_clause}
-                    GROUP BY u.user_id, u.username, u.full_name, u.role, u.department
-                    HAVING COUNT(ar.analysis_id) > 0
-                    ORDER BY positive_count DESC, positive_percentage DESC
-                    LIMIT 5
+                # Per-user totals from the daily rollup are computed once and ranked three ways;
+                # only users in the top 5 of some ranking come back
+                cursor.execute('''
+                    WITH totals AS (
+                        SELECT 
+                            u.user_id,
+                            u.username,
+                            u.full_name,
+                            u.role,
+                            u.department,
+                            s.total_calls,
+                            s.positive_count,
+                            s.negative_count,
+                            s.neutral_count,
+                            s.sum_quality / NULLIF(s.cnt_quality, 0) as avg_quality_score,
+                            s.total_duration,
+                            ROUND((s.positive_count * 100.0) / NULLIF(s.total_calls, 0), 2) as positive_percentage,
+                            ROUND((s.negative_count * 100.0) / NULLIF(s.total_calls, 0), 2) as negative_percentage,
+                            ROUND(
+                                (s.sum_quality / NULLIF(s.cnt_quality, 0) * 0.6) + 
+                                ((s.positive_count * 100.0) / NULLIF(s.total_calls, 0) * 0.4), 2
+                            ) as performance_score
+                        FROM users u
+                        JOIN (
+                            SELECT user_id,
+                                   SUM(total_calls) as total_calls,
+                                   SUM(positive_count) as positive_count,
+                                   SUM(negative_count) as negative_count,
+                                   SUM(neutral_count) as neutral_count,
+                                   SUM(sum_quality) as sum_quality,
+                                   SUM(cnt_quality) as cnt_quality,
+                                   SUM(sum_duration) as total_duration
+                            FROM user_sentiment_daily
+                            WHERE date >= :date_from AND date < :date_end
+                              AND (:industry IS NULL OR LOWER(industry) = LOWER(:industry))
+                            GROUP BY user_id
+                        ) s ON u.user_id = s.user_id
+                        WHERE s.total_calls > 0
+                    ),
+                    ranked AS (
+                        SELECT *,
+                               ROW_NUMBER() OVER (ORDER BY positive_count DESC, positive_percentage DESC, user_id) as positive_rank,
+                               ROW_NUMBER() OVER (ORDER BY negative_count ASC, negative_percentage ASC, user_id) as negative_rank,
+                               ROW_NUMBER() OVER (ORDER BY performance_score DESC, user_id) as performance_rank
+                        FROM totals
+                    )
+                    SELECT * FROM ranked
+                    WHERE positive_rank <= 5 OR negative_rank <= 5 OR performance_rank <= 5
                 ''', params)
+                rows = cursor.fetchall()
                 
-                top_positive_users = []
-                for row in cursor.fetchall():
-                    top_positive_users.append({
+                def user_entry(row):
+                    return {
                         'user_id': row[0],
                         'username': row[1],
                         'full_name': row[2],
@@ -570,103 +1229,30 @@ class CallAnalyzerDB:
                         'negative_count': row[7],
                         'neutral_count': row[8],
                         'avg_quality_score': round(row[9], 2) if row[9] else 0,
-                        'total_duration': round(row[10], 2) if row[10] else 0,
-                        'positive_percentage': row[11] if row[11] else 0
-                    })
-                
-                # Get top 5 users by negative sentiment count (lowest is better)
-                cursor.execute(f'''
-                    SELECT 
-                        u.user_id,
-                        u.username,
-                        u.full_name,
-                        u.role,
-                        u.department,
-                        COUNT(ar.analysis_id) as total_calls,
-                        SUM(CASE WHEN LOWER(ar.sentiment) = 'positive' THEN 1 ELSE 0 END) as positive_count,
-                        SUM(CASE WHEN LOWER(ar.sentiment) = 'negative' THEN 1 ELSE 0 END) as negative_count,
-                        SUM(CASE WHEN LOWER(ar.sentiment) = 'neutral' THEN 1 ELSE 0 END) as neutral_count,
-                        AVG(ar.quality_score) as avg_quality_score,
-                        SUM(ar.duration) as total_duration,
-                        ROUND(
-                            (SUM(CASE WHEN LOWER(ar.sentiment) = 'negative' THEN 1 ELSE 0 END) * 100.0) / 
-                            NULLIF(COUNT(ar.analysis_id), 0), 2
-                        ) as negative_percentage
-                    FROM users u
-                    LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                    {where_clause}
-                    GROUP BY u.user_id, u.username, u.full_name, u.role, u.department
-                    HAVING COUNT(ar.analysis_id) > 0
-                    ORDER BY negative_count ASC, negative_percentage ASC
-                    LIMIT 5
-                ''', params)
+                        'total_duration': round(row[10], 2) if row[10] else 0
+                    }
                 
-                top_low_negative_users = []
-                for row in cursor.fetchall():
-                    top_low_negative_users.append({
-                        'user_id': row[0],
-                        'username': row[1],
-                        'full_name': row[2],
-                        'role': row[3],
-                        'department': row[4],
-                        'total_calls': row[5],
-                        'positive_count': row[6],
-                        'negative_count': row[7],
-                        'neutral_count': row[8],
-                        'avg_quality_score': round(row[9], 2) if row[9] else 0,
-                        'total_duration': round(row[10], 2) if row[10] else 0,
-                        'negative_percentage': row[11] if row[11] else 0
-                    })
+                # Top 5 users by positive sentiment count
+                top_positive_users = [
+                    {**user_entry(row), 'positive_percentage': row[11] if row[11] else 0}
+                    for row in sorted((row for row in rows if row[14] <= 5), key=lambda row: row[14])
+                ]
                 
-                # Get top 5 users by overall performance (combination of positive sentiment and quality score)
-                cursor.execute(f'''
-                    SELECT 
-                        u.user_id,
-                        u.username,
-                        u.full_name,
-                        u.role,
-                        u.department,
-                        COUNT(ar.analysis_id) as total_calls,
-                        SUM(CASE WHEN LOWER(ar.sentiment) = 'positive' THEN 1 ELSE 0 END) as positive_count,
-                        SUM(CASE WHEN LOWER(ar.sentiment) = 'negative' THEN 1 ELSE 0 END) as negative_count,
-                        SUM(CASE WHEN LOWER(ar.sentiment) = 'neutral' THEN 1 ELSE 0 END) as neutral_count,
-                        AVG(ar.quality_score) as avg_quality_score,
-                        SUM(ar.duration) as total_duration,
-                        ROUND(
-                            (SUM(CASE WHEN LOWER(ar.sentiment) = 'positive' THEN 1 ELSE 0 END) * 100.0) / 
-                            NULLIF(COUNT(ar.analysis_id), 0), 2
-                        ) as positive_percentage,
-                        ROUND(
-                            (AVG(ar.quality_score) * 0.6) + 
-                            ((SUM(CASE WHEN LOWER(ar.sentiment) = 'positive' THEN 1 ELSE 0 END) * 100.0) / 
-                             NULLIF(COUNT(ar.analysis_id), 0) * 0.4), 2
-                        ) as performance_score
-                    FROM users u
-                    LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                    {where_clause}
-                    GROUP BY u.user_id, u.username, u.full_name, u.role, u.department
-                    HAVING COUNT(ar.analysis_id) > 0
-                    ORDER BY performance_score DESC
-                    LIMIT 5
-                ''', params)
+                # Top 5 users by negative sentiment count (lowest is better)
+                top_low_negative_users = [
+                    {**user_entry(row), 'negative_percentage': row[12] if row[12] else 0}
+                    for row in sorted((row for row in rows if row[15] <= 5), key=lambda row: row[15])
+                ]
                 
-                top_overall_performers = []
-                for row in cursor.fetchall():
-                    top_overall_performers.append({
-                        'user_id': row[0],
-                        'username': row[1],
-                        'full_name': row[2],
-                        'role': row[3],
-                        'department': row[4],
-                        'total_calls': row[5],
-                        'positive_count': row[6],
-                        'negative_count': row[7],
-                        'neutral_count': row[8],
-                        'avg_quality_score': round(row[9], 2) if row[9] else 0,
-                        'total_duration': round(row[10], 2) if row[10] else 0,
+                # Top 5 users by overall performance (combination of positive sentiment and quality score)
+                top_overall_performers = [
+                    {
+                        **user_entry(row),
                         'positive_percentage': row[11] if row[11] else 0,
-                        'performance_score': row[12] if row[12] else 0
-                    })
+                        'performance_score': row[13] if row[13] else 0
+                    }
+                    for row in sorted((row for row in rows if row[16] <= 5), key=lambda row: row[16])
+                ]
                 
                 return {
                     'top_positive_sentiment': top_positive_users,
@@ -677,6 +1263,7 @@ class CallAnalyzerDB:
         except Exception as e:
             print(f"Error retrieving top user performance: {e}")
             return {
+                'error': str(e),
                 'top_positive_sentiment': [],
                 'top_low_negative_sentiment': [],
                 'top_overall_performance': []
@@ -686,152 +1273,154 @@ class CallAnalyzerDB:
         """Get list of available industries (restricted to specified list)."""
         return ['eCommerce', 'Telecom', 'Healthcare', 'Travel', 'Real Estate', 'Customer Service', 'Insurance']
     
-    def get_analysis_results_by_user(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get analysis results for a specific user with pagination."""
+    def get_analysis_results_by_user(self, user_id: str, limit: int = 50, offset: int = 0,
+                                     after: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
+        """Get a page of a user's analyses for listing, without transcripts or bulky JSON.
+        
+        Pass `after` as the (processed_at, analysis_id) of the last row of the previous page
+        to seek straight to the next page instead of skipping `offset` rows.
+        """
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM analysis_results 
+                query = f'''
+                    SELECT {', '.join(_LISTING_COLUMNS)} FROM analysis_results
                     WHERE user_id = ?
-                    ORDER BY processed_at DESC 
-                    LIMIT ? OFFSET ?
-                ''', (user_id, limit, offset))
+                '''
+                params = [user_id]
+                if after is not None:
+                    query += "AND (processed_at, analysis_id) < (?, ?) "
+                    params.extend(after)
+                query += "ORDER BY processed_at DESC, analysis_id DESC LIMIT ? OFFSET ?"
+                params.extend([limit, offset])
+                
+                cursor.execute(query, params)
                 rows = cursor.fetchall()
                 
-                return [self._row_to_analysis_dict(row) for row in rows]
+                return [self._row_to_listing_dict(row) for row in rows]
                 
         except Exception as e:
             print(f"Error retrieving analysis results for user {user_id}: {e}")
             return []
     
+    @_cached_aggregate
     def get_user_performance_metrics(self, user_id: str, date_from: Optional[str] = None, date_to: Optional[str] = None) -> Dict[str, Any]:
         """Get comprehensive performance metrics for a specific user/agent."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
-                # Base WHERE clause
-                where_clause = "WHERE u.user_id = ?"
-                params = [user_id]
-                
-                # Add date filters if provided
-                if date_from:
-                    where_clause += " AND DATE(ar.processed_at) >= ?"
-                    params.append(date_from)
-                if date_to:
-                    where_clause += " AND DATE(ar.processed_at) <= ?"
-                    params.append(date_to)
-                
-                # Get basic metrics
-                cursor.execute(f'''
-                    SELECT 
-                        COUNT(ar.analysis_id) as total_calls,
-                        AVG(ar.quality_score) as avg_quality_score,
-                        AVG(ar.duration) as avg_call_duration,
-                        SUM(ar.duration) as total_call_duration,
-                        MIN(ar.processed_at) as first_call_date,
-                        MAX(ar.processed_at) as last_call_date
-                    FROM users u
-                    LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                    {where_clause}
-                ''', params)
-                
-                basic_metrics = dict(cursor.fetchone())
-                
-                # Get sentiment distribution
-                cursor.execute(f'''
-                    SELECT 
-                        ar.overall_sentiment_label as sentiment,
-                        COUNT(ar.analysis_id) as count,
-                        AVG(ar.overall_sentiment_score) as avg_score
-                    FROM users u
-                    LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                    {where_clause}
-                    GROUP BY ar.overall_sentiment_label
-                ''', params)
-                
-                sentiment_data = cursor.fetchall()
+                params = _filter_params(date_from, date_to, None)
+
+                # Unregistered ids report empty metrics without scanning analyses
+                cursor.execute('SELECT 1 FROM users WHERE user_id = ?', (user_id,))
+                user_exists = cursor.fetchone() is not None
+
+                rows = []
+                if user_exists:
+                    # One pass over the user's analyses; every distribution below
+                    # is aggregated from this result set instead of re-querying.
+                    cursor.execute(_USER_METRICS_SQL, {**params, 'user_id': user_id})
+                    rows = cursor.fetchall()
+
+                def average(total, count):
+                    return total / count if count else None
+
+                quality_total = quality_count = 0
+                duration_total = duration_count = 0
+                sentiments: Dict[Optional[str], List[float]] = {}
+                industries: Dict[Optional[str], List[float]] = {}
+                quality_counts: Dict[str, int] = {}
+                trend: Dict[str, List[float]] = {}
+                intents: Dict[str, int] = {}
+
+                for row in rows:
+                    quality = row['quality_score']
+                    duration = row['duration']
+                    if quality is not None:
+                        quality_total += quality
+                        quality_count += 1
+                    if duration is not None:
+                        duration_total += duration
+                        duration_count += 1
+
+                    # [count, score total, score count]
+                    bucket = sentiments.setdefault(row['overall_sentiment_label'], [0, 0, 0])
+                    bucket[0] += 1
+                    if row['overall_sentiment_score'] is not None:
+                        bucket[1] += row['overall_sentiment_score']
+                        bucket[2] += 1
+
+                    bucket = industries.setdefault(row['industry'], [0, 0, 0])
+                    bucket[0] += 1
+                    if quality is not None:
+                        bucket[1] += quality
+                        bucket[2] += 1
+
+                    if quality is not None and quality >= 8:
+                        category = 'Excellent'
+                    elif quality is not None and quality >= 6:
+                        category = 'Good'
+                    elif quality is not None and quality >= 4:
+                        category = 'Fair'
+                    else:
+                        category = 'Poor'
+                    quality_counts[category] = quality_counts.get(category, 0) + 1
+
+                    if row['is_recent']:
+                        bucket = trend.setdefault(row['call_date'], [0, 0, 0])
+                        bucket[0] += 1
+                        if quality is not None:
+                            bucket[1] += quality
+                            bucket[2] += 1
+
+                    if row['top_intent']:
+                        intents[row['top_intent']] = intents.get(row['top_intent'], 0) + 1
+
+                processed = [row['processed_at'] for row in rows if row['processed_at'] is not None]
+                basic_metrics = {
+                    'total_calls': len(rows),
+                    'avg_quality_score': average(quality_total, quality_count),
+                    'avg_call_duration': average(duration_total, duration_count),
+                    'total_call_duration': duration_total if duration_count else None,
+                    'first_call_date': min(processed, default=None),
+                    'last_call_date': max(processed, default=None)
+                }
+
+                # Keys are emitted in the order SQLite's GROUP BY used to return them
+                def group_order(key):
+                    return (key is not None, key or '')
+
                 sentiment_distribution = {}
-                for row in sentiment_data:
-                    sentiment_distribution[row['sentiment'] or 'neutral'] = {
-                        'count': row['count'],
-                        'avg_score': row['avg_score'] or 0
+                for label in sorted(sentiments, key=group_order):
+                    count, score_total, score_count = sentiments[label]
+                    sentiment_distribution[label or 'neutral'] = {
+                        'count': count,
+                        'avg_score': average(score_total, score_count) or 0
                     }
-                
-                # Get industry distribution
-                cursor.execute(f'''
-                    SELECT 
-                        ar.industry,
-                        COUNT(ar.analysis_id) as count,
-                        AVG(ar.quality_score) as avg_quality
-                    FROM users u
-                    LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                    {where_clause}
-                    GROUP BY ar.industry
-                ''', params)
-                
-                industry_data = cursor.fetchall()
+
                 industry_distribution = {}
-                for row in industry_data:
-                    industry_distribution[row['industry']] = {
-                        'count': row['count'],
-                        'avg_quality': row['avg_quality'] or 0
+                for industry in sorted(industries, key=group_order):
+                    count, quality_sum, quality_n = industries[industry]
+                    industry_distribution[industry] = {
+                        'count': count,
+                        'avg_quality': average(quality_sum, quality_n) or 0
                     }
-                
-                # Get quality score distribution
-                cursor.execute(f'''
-                    SELECT 
-                        CASE 
-                            WHEN ar.quality_score >= 8 THEN 'Excellent'
-                            WHEN ar.quality_score >= 6 THEN 'Good'
-                            WHEN ar.quality_score >= 4 THEN 'Fair'
-                            ELSE 'Poor'
-                        END as quality_category,
-                        COUNT(ar.analysis_id) as count
-                    FROM users u
-                    LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                    {where_clause}
-                    GROUP BY quality_category
-                ''', params)
-                
-                quality_data = cursor.fetchall()
-                quality_distribution = {}
-                for row in quality_data:
-                    quality_distribution[row['quality_category']] = row['count']
-                
-                # Get recent performance trend (last 30 days)
-                cursor.execute(f'''
-                    SELECT 
-                        DATE(ar.processed_at) as call_date,
-                        COUNT(ar.analysis_id) as daily_calls,
-                        AVG(ar.quality_score) as daily_avg_quality
-                    FROM users u
-                    LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                    {where_clause}
-                    AND DATE(ar.processed_at) >= DATE('now', '-30 days')
-                    GROUP BY DATE(ar.processed_at)
-                    ORDER BY call_date DESC
-                ''', params)
-                
-                trend_data = cursor.fetchall()
-                performance_trend = [dict(row) for row in trend_data]
-                
-                # Get top intents
-                cursor.execute(f'''
-                    SELECT 
-                        json_extract(ar.intents_data, '$[0].intent') as top_intent,
-                        COUNT(ar.analysis_id) as count
-                    FROM users u
-                    LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                    {where_clause}
-                    AND ar.intents_data IS NOT NULL
-                    GROUP BY top_intent
-                    ORDER BY count DESC 
-                ''', params)
-                
-                intent_data = cursor.fetchall()
-                top_intents = [dict(row) for row in intent_data if row['top_intent']]
+
+                quality_distribution = {category: quality_counts[category] for category in sorted(quality_counts)}
+
+                performance_trend = [
+                    {
+                        'call_date': call_date,
+                        'daily_calls': trend[call_date][0],
+                        'daily_avg_quality': average(trend[call_date][1], trend[call_date][2])
+                    }
+                    for call_date in sorted(trend, key=group_order, reverse=True)
+                ]
+
+                top_intents = [
+                    {'top_intent': intent, 'count': count}
+                    for intent, count in sorted(intents.items(), key=lambda item: (-item[1], item[0]))
+                ]
                 
                 return {
                     'user_id': user_id,
@@ -840,7 +1429,7 @@ class CallAnalyzerDB:
                     'industry_distribution': industry_distribution,
                     'quality_distribution': quality_distribution,
                     'performance_trend': performance_trend,
-                    'top_intents': intent_data,
+                    'top_intents': top_intents,
                     'date_range': {
                         'from': date_from,
                         'to': date_to
@@ -863,15 +1452,19 @@ class CallAnalyzerDB:
     def clear_all_data(self) -> bool:
         """Clear all data from tables without dropping the table structure."""
         try:
-            with self.get_connection() as conn:
+            with self.get_write_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Clear data from tables
                 cursor.execute('DELETE FROM processing_status')
                 cursor.execute('DELETE FROM analysis_results')
+                cursor.execute('DELETE FROM analysis_results_blobs')
+                cursor.execute('DELETE FROM user_sentiment_daily')
+                cursor.execute('DELETE FROM topic_stats_daily')
                 cursor.execute('DELETE FROM users')
                 
                 conn.commit()
+                self._invalidate_aggregates()
                 print("All data cleared successfully")
                 return True
                 
@@ -897,29 +1490,27 @@ class CallAnalyzerDB:
     
     def _insert_default_users(self):
         """Insert default users if the users table is empty."""
+        default_users = [                       
+            ('agent_001', 'Agent Smith', 'agent.smith@company.com', 'John Smith', 'Support', 'agent'),
+            ('agent_002', 'Agent Johnson', 'agent.johnson@company.com', 'Sarah Johnson', 'Support', 'agent'),
+            ('agent_003', 'Agent Brown', 'manager.brown@company.com', 'Michael Brown', 'Support', 'agent'),
+            ('admin_001', 'Admin User', 'admin@company.com', 'System Administrator', 'IT', 'admin'),
+        ]
         try:
-            with self.get_connection() as conn:
+            with self.get_write_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Check if users table is empty
-                cursor.execute('SELECT COUNT(*) FROM users')
-                count = cursor.fetchone()[0]
+                # One statement seeds an empty table; the emptiness check and the insert
+                # cannot interleave with another writer
+                values = ', '.join(['(?, ?, ?, ?, ?, ?)'] * len(default_users))
+                cursor.execute(f'''
+                    INSERT OR IGNORE INTO users (user_id, username, email, full_name, department, role)
+                    SELECT * FROM (VALUES {values})
+                    WHERE NOT EXISTS (SELECT 1 FROM users)
+                ''', [value for user in default_users for value in user])
                 
-                if count == 0:
-                    # Insert default users
-                    default_users = [                       
-                        ('agent_001', 'Agent Smith', 'agent.smith@company.com', 'John Smith', 'Support', 'agent'),
-                        ('agent_002', 'Agent Johnson', 'agent.johnson@company.com', 'Sarah Johnson', 'Support', 'agent'),
-                        ('agent_003', 'Agent Brown', 'manager.brown@company.com', 'Michael Brown', 'Support', 'agent'),
-                        ('admin_001', 'Admin User', 'admin@company.com', 'System Administrator', 'IT', 'admin'),
-                    ]
-                    
-                    cursor.executemany('''
-                        INSERT INTO users (user_id, username, email, full_name, department, role)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', default_users)
-                    
-                    conn.commit()
+                conn.commit()
+                if cursor.rowcount > 0:
                     print("Default users inserted successfully")
                     
         except Exception as e:
@@ -931,49 +1522,37 @@ class CallAnalyzerDB:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                if active_only:
-                    cursor.execute('''
-                        SELECT 
-                            u.user_id  as userId, 
-                            u.username as userName, 
-                            u.email, 
-                            u.full_name as fullName, 
-                            u.department, 
-                            u.role, 
-                            u.is_active as isActive, 
-                            u.created_at as createdAt,
-                            COALESCE(SUM(ar.duration), 0) as totalCallDuration,
-                            COUNT(ar.analysis_id) as totalCalls,
-                            SUM(CASE WHEN ar.sentiment = 'positive' THEN 1 ELSE 0 END) as positiveCount,
-                            SUM(CASE WHEN ar.sentiment = 'negative' THEN 1 ELSE 0 END) as negativeCount,
-                            SUM(CASE WHEN ar.sentiment = 'neutral' THEN 1 ELSE 0 END) as neutralCount
-                        FROM users u
-                        LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                        WHERE u.is_active = 1
-                        GROUP BY u.user_id, u.username, u.email, u.full_name, u.department, u.role, u.is_active, u.created_at
-                        ORDER BY u.username
-                    ''')
-                else:
-                    cursor.execute('''
-                        SELECT 
-                            u.user_id as userId, 
-                            u.username as userName, 
-                            u.email, 
-                            u.full_name as fullName, 
-                            u.department, 
-                            u.role, 
-                            u.is_active as isActive, 
-                            u.created_at as createdAt,
-                            COALESCE(SUM(ar.duration), 0) as totalCallDuration,
-                            COUNT(ar.analysis_id) as totalCalls,
-                            SUM(CASE WHEN ar.sentiment = 'positive' THEN 1 ELSE 0 END) as positiveCount,
-                            SUM(CASE WHEN ar.sentiment = 'negative' THEN 1 ELSE 0 END) as negativeCount,
-                            SUM(CASE WHEN ar.sentiment = 'neutral' THEN 1 ELSE 0 END) as neutralCount
-                        FROM users u
-                        LEFT JOIN analysis_results ar ON u.user_id = ar.user_id
-                        GROUP BY u.user_id, u.username, u.email, u.full_name, u.department, u.role, u.is_active, u.created_at
-                        ORDER BY u.username
-                    ''')
+                # Call totals come from the per-user daily rollup, which is far smaller
+                # than analysis_results and already holds the sentiment counts
+                cursor.execute('''
+                    SELECT 
+                        u.user_id as userId, 
+                        u.username as userName, 
+                        u.email, 
+                        u.full_name as fullName, 
+                        u.department, 
+                        u.role, 
+                        u.is_active as isActive, 
+                        u.created_at as createdAt,
+                        COALESCE(c.total_duration, 0) as totalCallDuration,
+                        COALESCE(c.total_calls, 0) as totalCalls,
+                        COALESCE(c.positive_count, 0) as positiveCount,
+                        COALESCE(c.negative_count, 0) as negativeCount,
+                        COALESCE(c.neutral_count, 0) as neutralCount
+                    FROM users u
+                    LEFT JOIN (
+                        SELECT user_id,
+                               SUM(sum_duration) as total_duration,
+                               SUM(total_calls) as total_calls,
+                               SUM(positive_count) as positive_count,
+                               SUM(negative_count) as negative_count,
+                               SUM(neutral_count) as neutral_count
+                        FROM user_sentiment_daily
+                        GROUP BY user_id
+                    ) c ON c.user_id = u.user_id
+                    WHERE NOT ? OR u.is_active = 1
+                    ORDER BY u.username
+                ''', (active_only,))
                 
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
@@ -1001,246 +1580,119 @@ class CallAnalyzerDB:
             return None
     
       
+    @_cached_aggregate
     def get_topic_statistics(self, date_from: Optional[str] = None, date_to: Optional[str] = None, industry: Optional[str] = None) -> Dict[str, Any]:
         """Get topic distribution statistics from analysis results."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None  # Columns are read by position
                 
-                # Build query with optional filters
-                query = '''
-                    SELECT topics_data, industry, processed_at
-                    FROM analysis_results 
-                    WHERE topics_data IS NOT NULL AND topics_data != ''
-                '''
-                params = []
-                
-                if date_from:
-                    query += ' AND processed_at >= ?'
-                    params.append(date_from)
-                
-                if date_to:
-                    query += ' AND processed_at <= ?'
-                    params.append(date_to)
-                
-                if industry:
-                    query += ' AND industry = ?'
-                    params.append(industry)
-                
-                query += ' ORDER BY processed_at DESC'
-                
-                cursor.execute(query, params)
+                # Kind 0 rows count the conversations mentioning each topic, kind 1 rows are per-industry
+                # dominant topic counts and kind 2 is the conversation total
+                cursor.execute('''
+                    WITH filtered AS (
+                        SELECT * FROM topic_stats_daily
+                        WHERE (NOT :has_dates OR (date >= :date_from AND date < :date_end))
+                        AND (:industry IS NULL OR industry = :industry)
+                    )
+                    SELECT 0 as kind, NULL as industry, topic, SUM(conversations) as count,
+                           SUM(sum_score) / SUM(mentions) as avg_score
+                    FROM filtered WHERE topic != ''
+                    GROUP BY topic HAVING SUM(conversations) > 0
+                    UNION ALL
+                    SELECT 1, industry, topic, SUM(dominant_mentions), NULL
+                    FROM filtered WHERE topic != ''
+                    GROUP BY industry, topic HAVING SUM(dominant_mentions) > 0
+                    UNION ALL
+                    SELECT 2, NULL, NULL, COALESCE(SUM(conversations), 0), NULL
+                    FROM filtered WHERE topic = ''
+                    ORDER BY kind, industry, count DESC, topic
+                ''', _filter_params(date_from, date_to, industry))
                 rows = cursor.fetchall()
                 
-                # Process topic data
-                topic_counts = {}
-                topic_scores = {}
-                industry_topics = {}
-                total_conversations = len(rows)
-                
-                for row in rows:
-                    try:
-                        topics_data = json.loads(row[0]) if row[0] else {}
-                        row_industry = row[1]
-                        
-                        # Extract dominant topics
-                        dominant_topics = topics_data.get('dominant_topics', [])
-                        topic_scores_data = topics_data.get('topic_scores', {})
-                        
-                        # Count dominant topics
-                        for topic_info in dominant_topics:
-                            if isinstance(topic_info, (list, tuple)) and len(topic_info) >= 2:
-                                topic_name = topic_info[0]
-                                topic_score = topic_info[1]
-                            elif isinstance(topic_info, dict):
-                                topic_name = topic_info.get('topic', '')
-                                topic_score = topic_info.get('score', 0)
-                            else:
-                                continue
-                            
-                            if topic_name:
-                                # Overall topic counts
-                                if topic_name not in topic_counts:
-                                    topic_counts[topic_name] = 0
-                                    topic_scores[topic_name] = []
-                                
-                                topic_counts[topic_name] += 1
-                                topic_scores[topic_name].append(topic_score)
-                                
-                                # Industry-specific topics
-                                if row_industry not in industry_topics:
-                                    industry_topics[row_industry] = {}
-                                
-                                if topic_name not in industry_topics[row_industry]:
-                                    industry_topics[row_industry][topic_name] = 0
-                                
-                                industry_topics[row_industry][topic_name] += 1
-                        
-                        # Also process topic_scores for additional topics
-                        for topic_name, score in topic_scores_data.items():
-                            if score > 0.1:  # Only include topics with meaningful scores
-                                if topic_name not in topic_counts:
-                                    topic_counts[topic_name] = 0
-                                    topic_scores[topic_name] = []
-                                
-                                topic_counts[topic_name] += 1
-                                topic_scores[topic_name].append(score)
-                    
-                    except (json.JSONDecodeError, KeyError, TypeError) as e:
-                        print(f"Error processing topic data: {e}")
-                        continue
+                total_conversations = next(row[3] for row in rows if row[0] == 2)
                 
-                # Calculate averages and percentages
+                # Rows arrive most frequent first, so only percentages are left to compute
                 topic_statistics = []
-                for topic, count in topic_counts.items():
-                    avg_score = sum(topic_scores[topic]) / len(topic_scores[topic]) if topic_scores[topic] else 0
-                    percentage = (count / total_conversations * 100) if total_conversations > 0 else 0
-                    
-                    topic_statistics.append({
-                        'topic': topic,
-                        'count': count,
-                        'percentage': round(percentage, 1),
-                        'avg_score': round(avg_score, 3),
-                        'formatted_name': topic.replace('_', ' ').title()
-                    })
-                
-                # Sort by count (most frequent first)
-                topic_statistics.sort(key=lambda x: x['count'], reverse=True)
+                industry_topics = {}
+                for kind, row_industry, topic, count, avg_score in rows:
+                    if kind == 0:
+                        percentage = (count / total_conversations * 100) if total_conversations > 0 else 0
+                        topic_statistics.append({
+                            'topic': topic,
+                            'count': count,
+                            'percentage': round(percentage, 1),
+                            'avg_score': round(avg_score or 0, 3),
+                            'formatted_name': topic.replace('_', ' ').title()
+                        })
+                    elif kind == 1:
+                        industry_topics.setdefault(row_industry, []).append((topic, count))
                 
                 # Prepare industry breakdown
                 industry_breakdown = {}
                 for industry, topics in industry_topics.items():
+                    industry_total = sum(count for _, count in topics)
                     industry_breakdown[industry] = [
                         {
                             'topic': topic,
                             'count': count,
-                            'percentage': round(count / sum(topics.values()) * 100, 1) if sum(topics.values()) > 0 else 0,
+                            'percentage': round(count / industry_total * 100, 1) if industry_total > 0 else 0,
                             'formatted_name': topic.replace('_', ' ').title()
                         }
-                        for topic, count in sorted(topics.items(), key=lambda x: x[1], reverse=True)
+                        for topic, count in topics
                     ]
                 
                 return {
                     'total_conversations': total_conversations,
                     'topic_distribution': topic_statistics[:15],  # Top 15 topics
                     'industry_breakdown': industry_breakdown,
-                    'total_unique_topics': len(topic_counts)
+                    'total_unique_topics': len(topic_statistics)
                 }
                 
         except Exception as e:
             print(f"Error retrieving topic statistics: {e}")
             return {
+                'error': str(e),
                 'total_conversations': 0,
                 'topic_distribution': [],
                 'industry_breakdown': {},
                 'total_unique_topics': 0
             }
     
+    @_cached_aggregate
     def get_topic_sentiment_analysis(self, date_from=None, date_to=None, industry=None):
         """Get topic-sentiment analysis data for dashboard with optional filters."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None  # Columns are read by position
                 
-                # Build the WHERE clause with filters
-                where_conditions = [
-                    "topics_data IS NOT NULL",
-                    "participant_sentiments IS NOT NULL"
-                ]
-                params = []
-
-                if date_from:
-                    where_conditions.append(" DATE(processed_at) >= ?")
-                    params.append(date_from)
-                if date_to:
-                    where_conditions.append(" DATE(processed_at) <= ?")
-                    params.append(date_to) 
-                
-                if industry:
-                    where_conditions.append("industry = ?")
-                    params.append(industry)
+                params = _filter_params(date_from, date_to, industry)
+                log.debug("Topic sentiment filters: %s", params)
+                cursor.execute(_TOPIC_SENTIMENT_SQL, params)
                 
-                where_clause = " AND ".join(where_conditions)
-                
-                # Get all analysis results with topics and sentiment data
-                query = f'''
-                    SELECT topics_data, participant_sentiments, overall_sentiment_label, overall_sentiment_score
-                    FROM analysis_results 
-                    WHERE {where_clause}
-                    ORDER BY created_at DESC
-                '''
-                print(f"qsentiment query {query}")
-                cursor.execute(query, params)
-                results = cursor.fetchall()
-                
-                if not results:
-                    return {
-                        'topicSentiments': [],
-                        'totalAnalyses': 0,
-                        'avgSentimentScore': 0.0
-                    }
-                
-                # Process topic-sentiment data
+                # Different raw topics can share a display name, so tally by display name
                 topic_sentiment_map = {}
-                total_sentiment_score = 0
-                valid_sentiment_count = 0
-                
-                for topics_json, sentiments_json, overall_sentiment, sentiment_score in results:
-                    try:
-                        # Parse topics data 
-                        if topics_json:
-                            topics_data = json.loads(topics_json) if isinstance(topics_json, str) else topics_json
-                            
-                            # Parse sentiment data
-                            if sentiments_json:
-                                sentiments_data = json.loads(sentiments_json) if isinstance(sentiments_json, str) else sentiments_json
-                                
-                                # Extract topics from different possible structures
-                                topics = []
-                                if isinstance(topics_data, dict):
-                                    if 'topics' in topics_data:
-                                        topics = topics_data['topics']
-                                    elif 'topic_scores' in topics_data:
-                                        topics = list(topics_data['topic_scores'].keys())
-                                    else:
-                                        topics = list(topics_data.keys())
-                                elif isinstance(topics_data, list):
-                                    topics = [t.get('topic', str(t)) if isinstance(t, dict) else str(t) for t in topics_data]
-                                
-                                # Process each topic
-                                for topic in topics[:5]:  # Top 5 topics
-                                    topic_name = topic.replace('_', ' ').title()
-                                    
-                                    if topic_name not in topic_sentiment_map:
-                                        topic_sentiment_map[topic_name] = {
-                                            'positive': 0,
-                                            'neutral': 0,
-                                            'negative': 0,
-                                            'total': 0
-                                        }
-                                    
-                                    # Determine sentiment for this conversation
-                                    if overall_sentiment:
-                                        sentiment_label = overall_sentiment.lower()
-                                        if sentiment_label in ['positive', 'satisfied', 'happy']:
-                                            topic_sentiment_map[topic_name]['positive'] += 1
-                                        elif sentiment_label in ['negative', 'frustrated', 'angry', 'concerned']:
-                                            topic_sentiment_map[topic_name]['negative'] += 1
-                                        else:
-                                            topic_sentiment_map[topic_name]['neutral'] += 1
-                                    else:
-                                        topic_sentiment_map[topic_name]['neutral'] += 1
-                                    
-                                    topic_sentiment_map[topic_name]['total'] += 1
-                        
-                        # Track overall sentiment score
-                        if sentiment_score is not None and sentiment_score > 0:
-                            total_sentiment_score += sentiment_score
-                            valid_sentiment_count += 1
-                            
-                    except (json.JSONDecodeError, KeyError, TypeError) as e:
-                        print(f"Error processing record: {e}")
+                total_analyses = 0
+                avg_sentiment_score = 0.0
+                for row in cursor.fetchall():
+                    if row[0] == 1:
+                        _, _, total_analyses, score_total, score_count = row
+                        avg_sentiment_score = (score_total / score_count) if score_count > 0 else 0.0
                         continue
+                    
+                    _, topic, positive, negative, total = row
+                    counts = topic_sentiment_map.setdefault(topic.replace('_', ' ').title(), {
+                        'positive': 0,
+                        'neutral': 0,
+                        'negative': 0,
+                        'total': 0
+                    })
+                    counts['positive'] += positive
+                    counts['negative'] += negative
+                    counts['neutral'] += total - positive - negative
+                    counts['total'] += total
                 
                 # Convert to percentage format
                 topic_sentiments = []
@@ -1257,17 +1709,16 @@ class CallAnalyzerDB:
                 # Sort by total conversations (most discussed topics first)
                 topic_sentiments.sort(key=lambda x: x['total_conversations'], reverse=True)
                 
-                avg_sentiment_score = (total_sentiment_score / valid_sentiment_count) if valid_sentiment_count > 0 else 0.0
-                
                 return {
                     'topicSentiments': topic_sentiments[:10],  # Top 10 topics
-                    'totalAnalyses': len(results),
+                    'totalAnalyses': total_analyses,
                     'avgSentimentScore': round(avg_sentiment_score, 2)
                 }
                 
         except Exception as e:
             print(f"Error in get_topic_sentiment_analysis: {e}")
             return {
+                'error': str(e),
                 'topicSentiments': [],
                 'totalAnalyses': 0,
                 'avgSentimentScore': 0.0
@@ -2,18 +2,25 @@ import spacy
 from spacy.tokens import DocBin
 import srsly
 
-# Load blank pipeline
-nlp = spacy.blank("en")
-doc_bin = DocBin()
-
-# Read JSONL
-for example in srsly.read_jsonl("train_data.jsonl"):
-    doc = nlp.make_doc(example["text"])
-    doc.cats = example["cats"]
-    doc_bin.add(doc)
-
-# Save to disk
-doc_bin.to_disk("train.spacy")
+
+def main():
+    # Load blank pipeline
+    nlp = spacy.blank("en")
+    doc_bin = DocBin()
+
+    # Read JSONL and tokenize in batches across all cores; the cats ride along as context
+    examples = ((example["text"], example["cats"]) for example in srsly.read_jsonl("train_data.jsonl"))
+    for doc, cats in nlp.pipe(examples, as_tuples=True, n_process=-1, batch_size=1000):
+        doc.cats = cats
+        doc_bin.add(doc)
+
+    # Save to disk
+    doc_bin.to_disk("train.spacy")
+
+
+# Worker processes re-import this module under the spawn start method
+if __name__ == "__main__":
+    main()
 
 
 #python -m spacy train config.cfg --output ./output --paths.train ./corpus/train.spacy --paths.dev ./corpus/train.spacy
@@ -86,7 +86,10 @@ export const ProcessingStatus: React.FC<ProcessingStatusProps> = ({
         };
         
         ws.onmessage = (event) => {
-          const data = JSON.parse(event.data);
+          // The server batches queued updates into one array per frame
+          const updates: StatusUpdate[] = JSON.parse(event.data);
+          const data = updates.find(update => update.analysis_id === analysisId);
+          if (!data) return;
           setStatus(data);
           
           // Update active step based on stage
@@ -8,10 +8,9 @@ import json
 import warnings
 import librosa
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Union
 from datetime import datetime
 import speech_recognition as sr
-from pydub import AudioSegment
 import torch
 import spacy
 
@@ -61,16 +60,22 @@ class AudioTranscriber:
                 print("Warning: No spaCy model available")
                 self.nlp = None
         
+        # Half precision only pays off (and is only supported) on GPU
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.use_fp16 = self.device == "cuda"
+        
         # Initialize Whisper model if available
         if WHISPER_AVAILABLE:
             try:
                 # Use tiny model by default for speed (can be overridden)
                 fast_model_size = "tiny" if model_size == "base" else model_size
-                self.whisper_model = whisper.load_model(fast_model_size)
-                print(f"Whisper model '{fast_model_size}' loaded successfully!")
+                self.whisper_model = whisper.load_model(fast_model_size, device=self.device)
+                print(f"Whisper model '{fast_model_size}' loaded successfully on {self.device}!")
             except Exception as e:
                 print(f"Warning: Failed to load Whisper model: {e}")
                 self.whisper_model = None
+            if self.whisper_model is not None:
+                self._compile_whisper_encoder()
         else:
             self.whisper_model = None
             print("Whisper not available, will use SpeechRecognition for transcription.")
@@ -78,49 +83,59 @@ class AudioTranscriber:
         
         print("Audio Transcriber initialized successfully!")
     
-    def convert_to_wav(self, audio_path: str) -> str:
-        """
-        Convert audio file to WAV format if needed.
-        
-        Args:
-            audio_path: Path to the input audio file
-            
-        Returns:
-            Path to the WAV file
-        """
-        if audio_path.lower().endswith('.wav'):
-            return audio_path
-        
-        # Convert to WAV
-        audio = AudioSegment.from_file(audio_path)
-        wav_path = audio_path.rsplit('.', 1)[0] + '_converted.wav'
-        audio.export(wav_path, format="wav")
-        
-        return wav_path
-    
-    def transcribe_with_whisper(self, audio_path: str) -> Dict[str, Any]:
+    def _compile_whisper_encoder(self):
+        """Compile the Whisper audio encoder on GPU, keeping the eager one if compilation fails."""
+        # The encoder always sees a fixed 30 s mel window, so it compiles once; the decoder
+        # runs token by token through kv-cache hooks and stays eager
+        if self.device != "cuda" or not hasattr(torch, "compile"):
+            return
+        eager_encoder = self.whisper_model.encoder
+        try:
+            self.whisper_model.encoder = torch.compile(eager_encoder)
+            # Compile now rather than during the first transcription
+            dummy_mel = torch.zeros(
+                1, self.whisper_model.dims.n_mels, 3000,
+                device=self.device, dtype=torch.float16 if self.use_fp16 else torch.float32
+            )
+            with torch.inference_mode():
+                self.whisper_model.embed_audio(dummy_mel)
+            print("Whisper encoder compiled")
+        except Exception as e:
+            self.whisper_model.encoder = eager_encoder
+            print(f"torch.compile skipped for Whisper: {e}")
+
+    def transcribe_with_whisper(self, audio_path: Union[str, np.ndarray]) -> Dict[str, Any]:
         """
         Transcribe audio using Whisper with fallback to SpeechRecognition.
         
         Args:
-            audio_path: Path to the audio file
+            audio_path: Path to the audio file, or already decoded 16kHz mono
+                float32 samples (Whisper consumes these directly)
             
         Returns:
             Transcription results with timestamps and segments
         """
-        print(f"Transcribing audio: {audio_path}")
-        
-        # Convert to WAV if needed
-        wav_path = self.convert_to_wav(audio_path)
+        if isinstance(audio_path, np.ndarray):
+            print(f"Transcribing decoded audio: {len(audio_path) / 16000:.1f}s")
+            audio = audio_path
+        else:
+            print(f"Transcribing audio: {audio_path}")
+            audio = None
         
         # Try Whisper first if available
         if self.whisper_model is not None:
             try:
+                # Decode any format straight to 16kHz mono float32 in one ffmpeg call,
+                # instead of exporting a temporary WAV for Whisper to decode again
+                if audio is None:
+                    audio = whisper.load_audio(audio_path)
+
                 # Transcribe with Whisper
                 result = self.whisper_model.transcribe(
-                    wav_path,
+                    audio,
                     verbose=True,
-                    word_timestamps=True
+                    word_timestamps=True,
+                    fp16=self.use_fp16
                 )
                 
                 # Extract segments with timestamps
@@ -140,10 +155,6 @@ class AudioTranscriber:
                     'duration': segments[-1]['end'] if segments else 0
                 }
                 
-                # Clean up converted file if it was created
-                if wav_path != audio_path and os.path.exists(wav_path):
-                    os.remove(wav_path)
-
                 # Filter out segments with empty or whitespace-only text
                 filtered_segments = [seg for seg in transcription_result.get("segments", []) if seg.get("text", "").strip()]
                 transcription_result["segments"] = filtered_segments;
@@ -156,7 +167,7 @@ class AudioTranscriber:
                 print("Falling back to SpeechRecognition...")
         
         
-        return null
+        return None
     
     def perform_speaker_diarization(self, transcription) -> List[Dict]:
         """
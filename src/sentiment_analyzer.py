@@ -1,4 +1,5 @@
 from typing import List, Dict
+from collections import defaultdict
 from transformers import pipeline
 import numpy as np
 
@@ -26,7 +27,7 @@ class SentimentAnalyzer:
                 'emotional_intensity': 0.0
             }
 
-        participant_sentiments = {}
+        participant_sentiments = defaultdict(list)
         sentiment_progression = []
         all_sentiments = []
 
@@ -47,8 +48,6 @@ class SentimentAnalyzer:
             sentiment['timestamp'] = timestamp
             sentiment['speaker'] = speaker
 
-            if speaker not in participant_sentiments:
-                participant_sentiments[speaker] = []
             participant_sentiments[speaker].append(sentiment)
 
             sentiment_progression.append({